@@ -1,14 +1,39 @@
+import array
+import base64
+import fnmatch
 import io
-import math
+import mmap
 import os
 import struct
 import sys
 import uuid
-from typing import Any, Callable, Optional, Sequence, Union
+from collections.abc import MutableMapping
+from concurrent.futures import Executor
+from math import isfinite
+from typing import Any, Callable, ClassVar, Iterator, Optional, Sequence, Union
 
 # Alias stdlib types to avoid name conflicts
 _float = float
 _bytes = bytes
+_Struct = struct.Struct
+
+# UUIDs are stored as four little-endian u32s, swapping each to big-endian
+# gives the bytes in the order they are printed
+_uuid_words = struct.Struct("<4I").unpack
+_uuid_pack = struct.Struct(">4I").pack
+# and back again
+_uuid_printed_words = struct.Struct(">4I").unpack
+_uuid_raw_pack = struct.Struct("<4I").pack
+
+
+def _uuid_str(raw_bytes: bytes) -> str:
+    h = _uuid_pack(*_uuid_words(raw_bytes)).hex()
+    return f"{h[:8]}-{h[8:12]}-{h[12:16]}-{h[16:20]}-{h[20:]}"
+
+
+def _uuid_raw_bytes(value: uuid.UUID) -> bytes:
+    return _uuid_raw_pack(*_uuid_printed_words(value.bytes))
+
 
 try:
     from recordclass import as_dataclass
@@ -20,7 +45,11 @@ if os.getenv("FORCE_STDLIB_ONLY") or "recordclass" not in sys.modules:
         print("Using stdlib-compatible UUID class")
 
     class UUID:
-        """Wrapper around uuid.UUID to delay evaluation of UUIDs until necessary"""
+        """Wrapper around uuid.UUID to delay evaluation of UUIDs until necessary
+
+        UUIDs compare equal to their uuid.UUID form and to their str form as
+        formatted by str(). They hash like that string, so dicts and sets
+        keyed by either form can be looked up with the other."""
 
         __slots__ = ("raw_bytes", "parsed_uuid", "parsed_str")
         raw_bytes: bytes
@@ -60,15 +89,7 @@ if os.getenv("FORCE_STDLIB_ONLY") or "recordclass" not in sys.modules:
 
         def __str__(self) -> str:
             if not self.parsed_str:
-                b = self.raw_bytes
-                self.parsed_str = "%08x-%04x-%04x-%04x-%04x%08x" % (
-                    (b[3] << 24) | (b[2] << 16) | (b[1] << 8) | (b[0]),
-                    (b[7] << 8) | (b[6]),
-                    (b[5] << 8) | (b[4]),
-                    (b[0xB] << 8) | (b[0xA]),
-                    (b[9] << 8) | (b[8]),
-                    (b[0xF] << 24) | (b[0xE] << 16) | (b[0xD] << 8) | (b[0xC]),
-                )
+                self.parsed_str = _uuid_str(self.raw_bytes)
             return self.parsed_str
 
         def UUID(self) -> uuid.UUID:
@@ -98,7 +119,11 @@ if os.getenv("FORCE_STDLIB_ONLY") or "recordclass" not in sys.modules:
         def __eq__(self, __value: object) -> bool:
             if isinstance(__value, UUID):
                 return self.raw_bytes == __value.raw_bytes
-            return str(self) == str(__value)
+            if isinstance(__value, str):
+                return str(self) == __value
+            if isinstance(__value, uuid.UUID):
+                return self.raw_bytes == _uuid_raw_bytes(__value)
+            return NotImplemented
 
         def __repr__(self) -> str:
             return "%s.UUID('%s')" % (self.__module__, str(self))
@@ -112,9 +137,13 @@ else:
 
     @as_dataclass(hashable=True, fast_new=True)
     class UUID:  # type: ignore[no-redef]
-        raw_bytes: bytes
         """Wrapper around uuid.UUID to delay evaluation of UUIDs until necessary"""
 
+        raw_bytes: bytes
+        # Formatted on first use, so a GUID shared through a UUIDRegistry is
+        # only formatted once
+        parsed_str: Optional[str] = None
+
         @staticmethod
         def from_str(s: str) -> "UUID":
             b = uuid.UUID(s).bytes
@@ -142,15 +171,9 @@ else:
             )
 
         def __str__(self) -> str:
-            b = self.raw_bytes
-            return "%08x-%04x-%04x-%04x-%04x%08x" % (
-                (b[3] << 24) | (b[2] << 16) | (b[1] << 8) | (b[0]),
-                (b[7] << 8) | (b[6]),
-                (b[5] << 8) | (b[4]),
-                (b[0xB] << 8) | (b[0xA]),
-                (b[9] << 8) | (b[8]),
-                (b[0xF] << 24) | (b[0xE] << 16) | (b[0xD] << 8) | (b[0xC]),
-            )
+            if self.parsed_str is None:
+                self.parsed_str = _uuid_str(self.raw_bytes)
+            return self.parsed_str
 
         def UUID(self) -> uuid.UUID:
             b = self.raw_bytes
@@ -174,19 +197,34 @@ else:
             )
             return uuid.UUID(int=uuid_int)
 
-        def __eq__(self, __value: object) -> bool:
-            if isinstance(__value, UUID):
-                return self.raw_bytes == __value.raw_bytes
-            return str(self) == str(__value)
-
-        def __ne__(self, __value: object) -> bool:
-            if isinstance(__value, UUID):
-                return self.raw_bytes != __value.raw_bytes
-            return str(self) != str(__value)
-
         def __repr__(self) -> str:
             return "%s.UUID('%s')" % (self.__module__, str(self))
 
+    # as_dataclass generates comparisons and hashing over the fields and
+    # replaces any defined in the class body, so these are set afterwards to
+    # match the stdlib class
+    def _uuid_eq(self: UUID, __value: object) -> bool:
+        if isinstance(__value, UUID):
+            return self.raw_bytes == __value.raw_bytes
+        if isinstance(__value, str):
+            return str(self) == __value
+        if isinstance(__value, uuid.UUID):
+            return self.raw_bytes == _uuid_raw_bytes(__value)
+        return NotImplemented
+
+    def _uuid_ne(self: UUID, __value: object) -> bool:
+        equal = _uuid_eq(self, __value)
+        if equal is NotImplemented:
+            return NotImplemented
+        return not equal
+
+    def _uuid_hash(self: UUID) -> int:
+        return hash(str(self))
+
+    UUID.__eq__ = _uuid_eq  # type: ignore[method-assign,assignment]
+    UUID.__ne__ = _uuid_ne  # type: ignore[method-assign,assignment]
+    UUID.__hash__ = _uuid_hash  # type: ignore[method-assign,assignment]
+
 
 # Specify a type for JSON-serializable objects
 JSON = Union[
@@ -205,15 +243,601 @@ def uuid_reader(reader: "FArchiveReader") -> UUID:
     b = reader.read(16)
     if len(b) != 16:
         raise Exception("could not read 16 bytes for uuid")
-    return UUID(b)
+    return reader.uuids[b]
+
+
+class UUIDRegistry(dict):
+    """Maps raw GUID bytes to a UUID, so every occurrence of the same GUID
+    in an archive shares one instance (and its cached string form) instead
+    of allocating one per reference."""
+
+    def __missing__(self, raw_bytes: bytes) -> UUID:
+        value = self[raw_bytes] = UUID(raw_bytes)
+        return value
+
+
+class PropertyStream:
+    """Properties decoded lazily from an FArchiveReader as they are iterated.
+
+    Values are read straight from the underlying archive, so the stream can
+    only be consumed once and must be consumed in order, including any lazy
+    values nested inside it.
+    """
+
+    __slots__ = ("pairs",)
+    pairs: Iterator[tuple[str, Any]]
+
+    def __init__(self, pairs: Iterator[tuple[str, Any]]) -> None:
+        self.pairs = pairs
+
+    def items(self) -> Iterator[tuple[str, Any]]:
+        return self.pairs
+
+
+class PathFilter:
+    """Selects which properties are decoded by their dotted path, e.g.
+    "worldSaveData.GroupSaveDataMap". Patterns are fnmatch globs matched
+    segment by segment, so "*" never matches across a ".".
+
+    A property is skipped if it matches an exclude pattern. If include
+    patterns are given, a property is only decoded if it matches one, is
+    inside a property that matches one, or contains properties that could
+    match one."""
+
+    include: Optional[list[list[str]]]
+    exclude: list[list[str]]
+    cache: dict[str, bool]
+
+    def __init__(
+        self,
+        include: Optional[Sequence[str]] = None,
+        exclude: Optional[Sequence[str]] = None,
+    ):
+        self.include = (
+            [PathFilter.segments(p) for p in include] if include is not None else None
+        )
+        self.exclude = [PathFilter.segments(p) for p in exclude or []]
+        self.cache = {}
+
+    @staticmethod
+    def segments(path: str) -> list[str]:
+        return path.lstrip(".").split(".")
+
+    def __call__(self, path: str) -> bool:
+        try:
+            return self.cache[path]
+        except KeyError:
+            selected = self.cache[path] = self.selects(path)
+            return selected
+
+    def selects(self, path: str) -> bool:
+        segments = PathFilter.segments(path)
+        for pattern in self.exclude:
+            if len(pattern) == len(segments) and all(
+                fnmatch.fnmatchcase(s, p) for s, p in zip(segments, pattern)
+            ):
+                return False
+        if self.include is None:
+            return True
+        for pattern in self.include:
+            # zip stops at the shorter of the two, covering both ancestors
+            # and descendants of the pattern
+            if all(fnmatch.fnmatchcase(s, p) for s, p in zip(segments, pattern)):
+                return True
+        return False
+
+
+class ChildPaths(dict):
+    """Interned paths of the direct children of a property, by name, built
+    the first time each child is seen."""
+
+    __slots__ = ("path",)
+    path: str
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+
+    def __missing__(self, name: str) -> str:
+        child = self[name] = sys.intern(f"{self.path}.{name}")
+        return child
+
+
+class PathTrie(dict):
+    """Maps a property path to its ChildPaths, so the dotted path of every
+    property is only built once per distinct path rather than once per
+    occurrence. Paths handed out are interned and their hashes cached, so
+    the type hint and custom property lookups made with them are cheap."""
+
+    def __missing__(self, path: str) -> ChildPaths:
+        children = self[path] = ChildPaths(path)
+        return children
+
+
+class LazyProperty(MutableMapping):
+    """A property read by a lazy FArchiveReader. Only the location of its body
+    is recorded when it is read; the body is decoded into a dict the first
+    time the property is accessed. FArchiveWriter copies the original bytes of
+    properties that are unchanged, see unchanged().
+
+    Edits are tracked conservatively: setting or deleting a key, calling
+    load() or reading a key that holds a mutable value (a list, a dict, raw
+    data...) marks the property as modified, since the value may be edited
+    in place. The one exception is the value of a struct made of properties,
+    whose child properties track their own edits."""
+
+    __slots__ = (
+        "reader",
+        "type_name",
+        "size",
+        "path",
+        "start",
+        "end",
+        "value",
+        "modified",
+        "children",
+    )
+    reader: "FArchiveReader"
+    type_name: str
+    size: int
+    path: str
+    start: int
+    end: int
+    value: Optional[dict[str, Any]]
+    modified: bool
+    # (name, property) pairs of a struct made of properties, as decoded
+    children: Optional[tuple[tuple[str, "LazyProperty"], ...]]
+
+    # Values that can be read without marking the property as modified
+    _immutable_types: ClassVar[tuple[type, ...]] = (
+        str,
+        int,
+        _float,
+        bool,
+        type(None),
+        _bytes,
+        UUID,
+        uuid.UUID,
+    )
+
+    def __init__(
+        self,
+        reader: "FArchiveReader",
+        type_name: str,
+        size: int,
+        path: str,
+        start: int,
+        end: int,
+    ) -> None:
+        self.reader = reader
+        self.type_name = type_name
+        self.size = size
+        self.path = path
+        self.start = start
+        self.end = end
+        self.value = None
+        self.modified = False
+        self.children = None
+
+    @property
+    def loaded(self) -> bool:
+        return self.value is not None
+
+    def peek(self) -> dict[str, Any]:
+        """Returns the decoded property without marking it as modified, for
+        callers that only read it, such as the JSON encoder."""
+        if self.value is None:
+            reader = self.reader
+            pos = reader.tell()
+            reader.seek(self.start)
+            try:
+                value = reader.property(self.type_name, self.size, self.path)
+            finally:
+                reader.seek(pos)
+            struct_value = value.get("value")
+            if (
+                self.type_name == "StructProperty"
+                and type(struct_value) is dict
+                and all(type(child) is LazyProperty for child in struct_value.values())
+            ):
+                self.children = tuple(struct_value.items())
+            self.value = value
+        return self.value
+
+    def load(self) -> dict[str, Any]:
+        """Returns the decoded property for editing."""
+        self.modified = True
+        return self.peek()
+
+    def unchanged(self) -> bool:
+        """Whether the original bytes still encode this property: it was
+        never decoded, or nothing was edited since, including in its child
+        properties."""
+        if self.value is None:
+            return True
+        if self.modified:
+            return False
+        children = self.children
+        if children is None:
+            return True
+        struct_value = self.value["value"]
+        return len(struct_value) == len(children) and all(
+            name == child_name and child is original and child.unchanged()
+            for (name, child), (child_name, original) in zip(
+                struct_value.items(), children
+            )
+        )
+
+    def raw(self) -> memoryview:
+        """Original bytes of the property body, following its size."""
+        return self.reader.data[self.start : self.end]
+
+    def __getitem__(self, key: str) -> Any:
+        value = self.peek()[key]
+        if type(value) not in LazyProperty._immutable_types and not (
+            key == "value" and self.children is not None
+        ):
+            self.modified = True
+        return value
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        self.load()[key] = value
+
+    def __delitem__(self, key: str) -> None:
+        del self.load()[key]
+
+    def __contains__(self, key: object) -> bool:
+        return key in self.peek()
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.peek())
+
+    def __len__(self) -> int:
+        return len(self.peek())
+
+    def __repr__(self) -> str:
+        return repr(self.peek())
+
+    def __reduce__(self):
+        # Copies and pickles are plain dicts, detached from the reader
+        return (dict, (self.load(),))
+
+
+class PropertyNode(MutableMapping):
+    """Base of the compact property classes produced by an FArchiveReader
+    with compact=True. Each class stores the keys of the equivalent property
+    dict in slots, with "type" implied by the class, and can be used as that
+    dict: it has the same keys in the same order, and only the values of
+    existing keys can be changed. to_dicts converts a tree of them back to
+    plain dicts."""
+
+    __slots__ = ()
+    type_name: ClassVar[str]
+    fields: ClassVar[tuple[str, ...]]
+
+    def __getitem__(self, key: str) -> Any:
+        if key == "type":
+            return self.type_name
+        if key in self.fields:
+            return getattr(self, key)
+        raise KeyError(key)
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        if key in self.fields:
+            setattr(self, key, value)
+        elif key != "type" or value != self.type_name:
+            raise KeyError(f"Cannot set {key!r} on a {self.type_name}")
+
+    def __delitem__(self, key: str) -> None:
+        raise KeyError(f"Cannot delete {key!r} from a {self.type_name}")
+
+    def __contains__(self, key: object) -> bool:
+        return key == "type" or key in self.fields
+
+    def __iter__(self) -> Iterator[str]:
+        yield from self.fields
+        yield "type"
+
+    def __len__(self) -> int:
+        return len(self.fields) + 1
+
+    def __repr__(self) -> str:
+        return repr(dict(self.items()))
+
+    def __reduce__(self):
+        return (dict, (list(self.items()),))
+
+    def to_dict(self) -> dict[str, Any]:
+        value = {field: getattr(self, field) for field in self.fields}
+        value["type"] = self.type_name
+        return value
+
+
+class ValueProp(PropertyNode):
+    __slots__ = ("id", "value")
+    fields = ("id", "value")
+    id: Optional[UUID]
+    value: Any
+
+    def __init__(self, id: Optional[UUID], value: Any) -> None:
+        self.id = id
+        self.value = value
+
+
+class IntProp(ValueProp):
+    __slots__ = ()
+    type_name = "IntProperty"
+
+
+class UInt16Prop(ValueProp):
+    __slots__ = ()
+    type_name = "UInt16Property"
+
+
+class UInt32Prop(ValueProp):
+    __slots__ = ()
+    type_name = "UInt32Property"
+
+
+class Int64Prop(ValueProp):
+    __slots__ = ()
+    type_name = "Int64Property"
+
+
+class FixedPoint64Prop(ValueProp):
+    __slots__ = ()
+    type_name = "FixedPoint64Property"
+
+
+class FloatProp(ValueProp):
+    __slots__ = ()
+    type_name = "FloatProperty"
+
+
+class StrProp(ValueProp):
+    __slots__ = ()
+    type_name = "StrProperty"
+
+
+class NameProp(ValueProp):
+    __slots__ = ()
+    type_name = "NameProperty"
+
+
+class EnumProp(ValueProp):
+    __slots__ = ()
+    type_name = "EnumProperty"
+
+
+class ByteProp(ValueProp):
+    __slots__ = ()
+    type_name = "ByteProperty"
+
+
+class BoolProp(PropertyNode):
+    __slots__ = ("value", "id")
+    type_name = "BoolProperty"
+    fields = ("value", "id")
+    value: bool
+    id: Optional[UUID]
+
+    def __init__(self, value: bool, id: Optional[UUID]) -> None:
+        self.value = value
+        self.id = id
+
+
+class StructProp(PropertyNode):
+    __slots__ = ("struct_type", "struct_id", "id", "value")
+    type_name = "StructProperty"
+    fields = ("struct_type", "struct_id", "id", "value")
+    struct_type: str
+    struct_id: UUID
+    id: Optional[UUID]
+    value: Any
+
+    def __init__(
+        self, struct_type: str, struct_id: UUID, id: Optional[UUID], value: Any
+    ) -> None:
+        self.struct_type = struct_type
+        self.struct_id = struct_id
+        self.id = id
+        self.value = value
+
+
+class ArrayProp(PropertyNode):
+    __slots__ = ("array_type", "id", "value")
+    type_name = "ArrayProperty"
+    fields = ("array_type", "id", "value")
+    array_type: str
+    id: Optional[UUID]
+    value: dict[str, Any]
+
+    def __init__(
+        self, array_type: str, id: Optional[UUID], value: dict[str, Any]
+    ) -> None:
+        self.array_type = array_type
+        self.id = id
+        self.value = value
+
+
+class MapProp(PropertyNode):
+    __slots__ = (
+        "key_type",
+        "value_type",
+        "key_struct_type",
+        "value_struct_type",
+        "id",
+        "value",
+    )
+    type_name = "MapProperty"
+    fields = (
+        "key_type",
+        "value_type",
+        "key_struct_type",
+        "value_struct_type",
+        "id",
+        "value",
+    )
+    key_type: str
+    value_type: str
+    key_struct_type: Optional[str]
+    value_struct_type: Optional[str]
+    id: Optional[UUID]
+    value: list[dict[str, Any]]
+
+    def __init__(
+        self,
+        key_type: str,
+        value_type: str,
+        key_struct_type: Optional[str],
+        value_struct_type: Optional[str],
+        id: Optional[UUID],
+        value: list[dict[str, Any]],
+    ) -> None:
+        self.key_type = key_type
+        self.value_type = value_type
+        self.key_struct_type = key_struct_type
+        self.value_struct_type = value_struct_type
+        self.id = id
+        self.value = value
+
+
+_property_nodes: tuple[Any, ...] = (
+    IntProp,
+    UInt16Prop,
+    UInt32Prop,
+    Int64Prop,
+    FixedPoint64Prop,
+    FloatProp,
+    StrProp,
+    NameProp,
+    EnumProp,
+    ByteProp,
+    BoolProp,
+    StructProp,
+    ArrayProp,
+    MapProp,
+)
+# PropertyNode classes by the property type they hold
+PROPERTY_NODES: dict[str, Any] = {node.type_name: node for node in _property_nodes}
+
+
+def to_dicts(value: Any) -> Any:
+    """Returns a copy of a property tree with every PropertyNode replaced by
+    the equivalent dict. LazyProperty values are decoded without being
+    marked as modified and copied the same way. Other values are returned
+    as is."""
+    if isinstance(value, LazyProperty):
+        value = value.peek()
+    if isinstance(value, PropertyNode):
+        return {key: to_dicts(v) for key, v in value.items()}
+    if isinstance(value, dict):
+        return {key: to_dicts(v) for key, v in value.items()}
+    if isinstance(value, list):
+        return [to_dicts(v) for v in value]
+    return value
+
+
+# Limits of the fstring caches: each reader (with its sub readers) caches
+# decoded ASCII fstrings of up to FSTRING_CACHE_MAX_LENGTH bytes, and stops
+# adding to its cache once it holds FSTRING_CACHE_SIZE strings.
+FSTRING_CACHE_SIZE = 1 << 16
+FSTRING_CACHE_MAX_LENGTH = 128
+# Encoded fstrings, length and terminator included, by their str, shared by
+# all writers with the same limits
+_encoded_fstring_cache: dict[str, bytes] = {}
+
+
+def encode_fstring(string: str) -> bytes:
+    if string == "":
+        return b"\x00\x00\x00\x00"
+    if string.isascii():
+        str_bytes = string.encode("ascii")
+        return struct.pack("<i", len(str_bytes) + 1) + str_bytes + b"\x00"
+    str_bytes = string.encode("utf-16-le", errors="surrogatepass")
+    assert len(str_bytes) % 2 == 0
+    return struct.pack("<i", -((len(str_bytes) // 2) + 1)) + str_bytes + b"\x00\x00"
+
+
+def _optional_guid_and(
+    unpack: Callable[[Any, int], tuple[Any, ...]],
+    width: int,
+    type_name: str,
+    node: Any = None,
+) -> Callable[["FArchiveReader", int, str], Any]:
+    """Builds a decoder for a property holding an optional GUID followed by
+    a fixed width primitive, read without going through the reader's
+    methods. With node, the decoder builds that PropertyNode class instead
+    of a dict."""
+
+    def read_property(reader: "FArchiveReader", size: int, path: str):
+        data = reader.data
+        pos = reader.pos
+        _id: Optional[UUID]
+        if data[pos]:
+            _id = reader.uuids[FArchiveReader.unpack_guid(data, pos + 1)[0]]
+            pos += 17
+        else:
+            _id = None
+            pos += 1
+        reader.pos = pos + width
+        return {
+            "id": _id,
+            "value": unpack(data, pos)[0],
+            "type": type_name,
+        }
+
+    def read_node(reader: "FArchiveReader", size: int, path: str):
+        data = reader.data
+        pos = reader.pos
+        _id: Optional[UUID]
+        if data[pos]:
+            _id = reader.uuids[FArchiveReader.unpack_guid(data, pos + 1)[0]]
+            pos += 17
+        else:
+            _id = None
+            pos += 1
+        reader.pos = pos + width
+        return node(_id, unpack(data, pos)[0])
+
+    if node is not None:
+        return read_node
+    return read_property
+
+
+def _optional_guid_and_fstring(
+    type_name: str, node: Any = None
+) -> Callable[["FArchiveReader", int, str], Any]:
+    def read_property(reader: "FArchiveReader", size: int, path: str):
+        return {
+            "id": reader.optional_guid(),
+            "value": reader.fstring(),
+            "type": type_name,
+        }
+
+    def read_node(reader: "FArchiveReader", size: int, path: str):
+        return node(reader.optional_guid(), reader.fstring())
+
+    if node is not None:
+        return read_node
+    return read_property
 
 
 class FArchiveReader:
-    data: io.BytesIO
+    data: memoryview
+    pos: int
     size: int
     type_hints: dict[str, str]
     custom_properties: dict[str, tuple[Callable, Callable]]
     debug: bool
+    lazy: bool
+    path_filter: Optional["PathFilter"]
+    executor: Optional[Executor]
+    paths: PathTrie
+    struct_types: dict[str, str]
+    uuids: UUIDRegistry
+    buffer: Optional[Union[bytes, mmap.mmap]]
+    fstrings: dict[bytes, str]
+    property_readers: dict[str, Callable[["FArchiveReader", int, str], Any]]
 
     def __init__(
         self,
@@ -222,152 +846,307 @@ class FArchiveReader:
         custom_properties: dict[str, tuple[Callable, Callable]] = {},
         debug: bool = os.environ.get("DEBUG", "0") == "1",
         allow_nan: bool = True,
+        lazy: bool = False,
+        path_filter: Optional["PathFilter"] = None,
+        executor: Optional[Executor] = None,
+        compact: bool = False,
     ):
-        self.data = io.BytesIO(data)
-        self.size = len(data)
+        # Work on a memoryview with an integer cursor so primitives can be
+        # unpacked in place instead of allocating a bytes object per read
+        self.data = memoryview(data).cast("B")
+        # Slices of bytes and mmap buffers are bytes, so fstring cache keys
+        # are sliced from these directly rather than copied out of the view
+        self.buffer = data if isinstance(data, (_bytes, mmap.mmap)) else None
+        self.pos = 0
+        self.size = len(self.data)
         self.type_hints = type_hints
         self.custom_properties = custom_properties
         self.debug = debug
         self.allow_nan = allow_nan
+        # When lazy, properties_until_end returns LazyProperty values that
+        # keep a reference to this reader, so the data must not be released
+        self.lazy = lazy
+        # Properties rejected by the filter are skipped using their size
+        self.path_filter = path_filter
+        # Used by custom properties to decode independent raw blobs in
+        # parallel, see rawdata.common.decode_entries
+        self.executor = executor
+        # When compact, properties are decoded into PropertyNode objects
+        # rather than dicts
+        if compact:
+            self.property_readers = FArchiveReader._compact_property_readers
+        else:
+            self.property_readers = FArchiveReader._property_readers
+        self.paths = PathTrie()
+        # Struct types resolved by get_type_or, by path
+        self.struct_types = {}
+        self.uuids = UUIDRegistry()
+        # Decoded ASCII fstrings by their raw bytes
+        self.fstrings = {}
 
     def __enter__(self):
-        self.data.seek(0)
+        self.pos = 0
         return self
 
     def __exit__(self, type, value, traceback):
-        self.data.close()
+        self.data.release()
 
     def internal_copy(self, data, debug: bool) -> "FArchiveReader":
-        return FArchiveReader(
-            data,
-            self.type_hints,
-            self.custom_properties,
-            debug=debug,
-            allow_nan=self.allow_nan,
-        )
+        return self.sub_reader(data, debug)
+
+    def sub_reader(self, data, debug: bool = False) -> "FArchiveReader":
+        """Returns a reader over a raw data blob, which may be bytes or a
+        memoryview into this reader's buffer and is not copied. The new
+        reader shares this reader's type hints, custom properties and
+        caches, and decodes eagerly into dicts without a path filter or
+        executor."""
+        reader = FArchiveReader.__new__(FArchiveReader)
+        reader.buffer = None
+        if not isinstance(data, memoryview):
+            if not isinstance(data, (_bytes, bytearray)):
+                data = _bytes(data)
+            if isinstance(data, _bytes):
+                reader.buffer = data
+            data = memoryview(data)
+        reader.data = data
+        reader.pos = 0
+        reader.size = len(data)
+        reader.type_hints = self.type_hints
+        reader.custom_properties = self.custom_properties
+        reader.debug = debug
+        reader.allow_nan = self.allow_nan
+        reader.lazy = False
+        reader.path_filter = None
+        reader.executor = None
+        reader.property_readers = FArchiveReader._property_readers
+        reader.paths = self.paths
+        reader.struct_types = self.struct_types
+        reader.uuids = self.uuids
+        reader.fstrings = self.fstrings
+        return reader
 
     def get_type_or(self, path: str, default: str):
+        try:
+            return self.struct_types[path]
+        except KeyError:
+            pass
         if path in self.type_hints:
-            return self.type_hints[path]
+            struct_type = self.type_hints[path]
         else:
             print(f"Struct type for {path} not found, assuming {default}")
-            return default
+            struct_type = default
+        self.struct_types[path] = struct_type
+        return struct_type
+
+    def tell(self) -> int:
+        return self.pos
+
+    def seek(self, pos: int) -> None:
+        self.pos = pos
 
     def eof(self) -> bool:
-        return self.data.tell() >= self.size
+        return self.pos >= self.size
 
     def read(self, size: int) -> bytes:
-        return self.data.read(size)
+        pos = self.pos
+        b = self.data[pos : pos + size].tobytes()
+        self.pos = pos + len(b)
+        return b
 
     def read_to_end(self) -> bytes:
-        return self.data.read(self.size - self.data.tell())
+        return self.read(self.size - self.pos)
 
     def bool(self) -> bool:
         return self.byte() > 0
 
     def fstring(self) -> str:
         # in the hot loop, avoid function calls
-        reader = self.data
-        (size,) = FArchiveReader.unpack_i32(reader.read(4))
+        data = self.data
+        pos = self.pos
+        (size,) = FArchiveReader.unpack_i32(data, pos)
+        pos += 4
 
         if size == 0:
+            self.pos = pos
             return ""
 
-        data: bytes
         encoding: str
         if size < 0:
             size = -size
-            data = reader.read(size * 2)[:-2]
+            end = pos + size * 2
+            str_data = data[pos : end - 2]
             encoding = "utf-16-le"
         else:
-            data = reader.read(size)[:-1]
+            end = pos + size
+            if size <= FSTRING_CACHE_MAX_LENGTH:
+                # Names, types and enum values repeat throughout a save,
+                # share one str per distinct value. A hit only costs the key
+                # slice, which is taken straight from the buffer if it can be
+                buffer = self.buffer
+                if buffer is not None:
+                    key = buffer[pos : end - 1]
+                else:
+                    key = data[pos : end - 1].tobytes()
+                fstrings = self.fstrings
+                cached = fstrings.get(key)
+                if cached is not None:
+                    self.pos = end
+                    return cached
+                try:
+                    string = sys.intern(str(key, "ascii"))
+                except UnicodeDecodeError:
+                    pass
+                else:
+                    if len(fstrings) < FSTRING_CACHE_SIZE:
+                        fstrings[key] = string
+                    self.pos = end
+                    return string
+            str_data = data[pos : end - 1]
             encoding = "ascii"
+        self.pos = end
 
         try:
-            return data.decode(encoding)
+            return str(str_data, encoding)
         except Exception as e:
             try:
-                escaped = data.decode(encoding, errors="surrogatepass")
+                escaped = str(str_data, encoding, "surrogatepass")
                 print(
-                    f"Error decoding {encoding} string of length {size}, data loss may occur! {bytes(data)!r}"
+                    f"Error decoding {encoding} string of length {size}, data loss may occur! {bytes(str_data)!r}"
                 )
                 return escaped
             except Exception as e:
                 raise Exception(
-                    f"Error decoding {encoding} string of length {size}: {bytes(data)!r}"
+                    f"Error decoding {encoding} string of length {size}: {bytes(str_data)!r}"
                 ) from e
 
-    unpack_i16 = struct.Struct("h").unpack
+    unpack_i16 = struct.Struct("h").unpack_from
 
     def i16(self) -> int:
-        return FArchiveReader.unpack_i16(self.data.read(2))[0]
+        pos = self.pos
+        self.pos = pos + 2
+        return FArchiveReader.unpack_i16(self.data, pos)[0]
 
-    unpack_u16 = struct.Struct("H").unpack
+    unpack_u16 = struct.Struct("H").unpack_from
 
     def u16(self) -> int:
-        return FArchiveReader.unpack_u16(self.data.read(2))[0]
+        pos = self.pos
+        self.pos = pos + 2
+        return FArchiveReader.unpack_u16(self.data, pos)[0]
 
-    unpack_i32 = struct.Struct("i").unpack
+    unpack_i32 = struct.Struct("i").unpack_from
 
     def i32(self) -> int:
-        return FArchiveReader.unpack_i32(self.data.read(4))[0]
+        pos = self.pos
+        self.pos = pos + 4
+        return FArchiveReader.unpack_i32(self.data, pos)[0]
 
-    unpack_u32 = struct.Struct("I").unpack
+    unpack_u32 = struct.Struct("I").unpack_from
 
     def u32(self) -> int:
-        return FArchiveReader.unpack_u32(self.data.read(4))[0]
+        pos = self.pos
+        self.pos = pos + 4
+        return FArchiveReader.unpack_u32(self.data, pos)[0]
 
-    unpack_i64 = struct.Struct("q").unpack
+    unpack_i64 = struct.Struct("q").unpack_from
 
     def i64(self) -> int:
-        return FArchiveReader.unpack_i64(self.data.read(8))[0]
+        pos = self.pos
+        self.pos = pos + 8
+        return FArchiveReader.unpack_i64(self.data, pos)[0]
 
-    unpack_u64 = struct.Struct("Q").unpack
+    unpack_u64 = struct.Struct("Q").unpack_from
 
     def u64(self) -> int:
-        return FArchiveReader.unpack_u64(self.data.read(8))[0]
+        pos = self.pos
+        self.pos = pos + 8
+        return FArchiveReader.unpack_u64(self.data, pos)[0]
 
-    unpack_float = struct.Struct("f").unpack
+    unpack_float = struct.Struct("f").unpack_from
 
     def float(self) -> Optional[_float]:
-        val = FArchiveReader.unpack_float(self.data.read(4))[0]
-        if self.allow_nan:
+        pos = self.pos
+        self.pos = pos + 4
+        val = FArchiveReader.unpack_float(self.data, pos)[0]
+        if self.allow_nan or isfinite(val):
             return val
-        if val == math.nan or val == math.inf or val == -math.inf:
-            return None
-        return val
+        return None
 
-    unpack_double = struct.Struct("d").unpack
+    unpack_double = struct.Struct("d").unpack_from
 
     def double(self) -> Optional[_float]:
-        val = FArchiveReader.unpack_double(self.data.read(8))[0]
-        if self.allow_nan:
+        pos = self.pos
+        self.pos = pos + 8
+        val = FArchiveReader.unpack_double(self.data, pos)[0]
+        if self.allow_nan or isfinite(val):
             return val
-        if val == math.nan or val == math.inf or val == -math.inf:
-            return None
-        return val
+        return None
 
-    unpack_byte = struct.Struct("B").unpack
+    unpack_byte = struct.Struct("B").unpack_from
 
     def byte(self) -> int:
-        return FArchiveReader.unpack_byte(self.data.read(1))[0]
+        pos = self.pos
+        self.pos = pos + 1
+        return self.data[pos]
 
     def byte_list(self, size: int) -> Sequence[int]:
-        return struct.unpack(str(size) + "B", self.data.read(size))
+        pos = self.pos
+        self.pos = pos + size
+        return struct.unpack_from(str(size) + "B", self.data, pos)
 
     def skip(self, size: int) -> None:
-        self.data.read(size)
+        self.pos += size
+
+    unpack_guid = struct.Struct("16s").unpack_from
 
     def guid(self) -> UUID:
         # in the hot loop, avoid function calls
-        return UUID(self.data.read(16))
+        pos = self.pos
+        self.pos = pos + 16
+        return self.uuids[FArchiveReader.unpack_guid(self.data, pos)[0]]
 
     def optional_guid(self) -> Optional[UUID]:
         # in the hot loop, avoid function calls
-        if self.data.read(1)[0]:
-            return UUID(self.data.read(16))
+        pos = self.pos
+        if self.data[pos]:
+            self.pos = pos + 17
+            return self.uuids[FArchiveReader.unpack_guid(self.data, pos + 1)[0]]
+        self.pos = pos + 1
         return None
 
+    iter_unpack_guids = struct.Struct("16s").iter_unpack
+
+    def guids(self, count: int) -> list[UUID]:
+        """Reads count consecutive GUIDs in one pass."""
+        uuids = self.uuids
+        return [
+            uuids[b]
+            for (b,) in FArchiveReader.iter_unpack_guids(self.slice(16 * count))
+        ]
+
+    iter_unpack_instance_ids = struct.Struct("16s16s").iter_unpack
+
+    def instance_ids(self, count: int) -> list[dict[str, UUID]]:
+        """Reads count consecutive instance_id_reader values in one pass."""
+        uuids = self.uuids
+        return [
+            {
+                "guid": uuids[guid],
+                "instance_id": uuids[instance_id],
+            }
+            for guid, instance_id in FArchiveReader.iter_unpack_instance_ids(
+                self.slice(32 * count)
+            )
+        ]
+
+    def slice(self, size: int) -> memoryview:
+        """Returns a view of the next size bytes and advances past them."""
+        pos = self.pos
+        end = pos + size
+        if end > self.size:
+            raise Exception(f"could not read {size} bytes at {pos}")
+        self.pos = end
+        return self.data[pos:end]
+
     def tarray(self, type_reader: Callable[["FArchiveReader"], Any]) -> list[Any]:
         count = self.u32()
         array = []
@@ -376,156 +1155,409 @@ class FArchiveReader:
         return array
 
     def properties_until_end(self, path: str = "") -> dict[str, Any]:
-        properties = {}
+        properties: dict[str, Any] = {}
+        child_paths = self.paths[path]
         while True:
             name = self.fstring()
             if name == "None":
                 break
             type_name = self.fstring()
             size = self.u64()
-            properties[name] = self.property(type_name, size, f"{path}.{name}")
+            property_path = child_paths[name]
+            if self.path_filter is not None and not self.path_filter(property_path):
+                self.skip_property(type_name, size)
+            elif self.lazy:
+                start = self.pos
+                self.skip_property(type_name, size)
+                properties[name] = LazyProperty(
+                    self, type_name, size, property_path, start, self.pos
+                )
+            else:
+                properties[name] = self.property(type_name, size, property_path)
         return properties
 
-    def property(
-        self, type_name: str, size: int, path: str, nested_caller_path: str = ""
-    ) -> dict[str, Any]:
-        value = {}
-        if path in self.custom_properties and (
-            path is not nested_caller_path or nested_caller_path == ""
+    def skip_property(self, type_name: str, size: int) -> None:
+        """Skips the body of a property, leaving the reader where property()
+        would after decoding it."""
+        if type_name == "StructProperty":
+            self.fstring()
+            self.skip(16)
+        elif type_name in ("ArrayProperty", "EnumProperty", "ByteProperty"):
+            self.fstring()
+        elif type_name == "MapProperty":
+            self.fstring()
+            self.fstring()
+        elif type_name == "BoolProperty":
+            self.skip(1)
+        elif type_name not in (
+            "IntProperty",
+            "UInt16Property",
+            "UInt32Property",
+            "Int64Property",
+            "FixedPoint64Property",
+            "FloatProperty",
+            "StrProperty",
+            "NameProperty",
         ):
-            value = self.custom_properties[path][0](self, type_name, size, path)
-            value["custom_type"] = path
+            raise Exception(f"Unknown type: {type_name}")
+        self.optional_guid()
+        self.skip(size)
+
+    def properties_stream(self, path: str = "") -> PropertyStream:
+        return PropertyStream(self._properties_stream(path))
+
+    def _properties_stream(self, path: str) -> Iterator[tuple[str, Any]]:
+        child_paths = self.paths[path]
+        while True:
+            name = self.fstring()
+            if name == "None":
+                break
+            type_name = self.fstring()
+            size = self.u64()
+            property_path = child_paths[name]
+            if self.path_filter is not None and not self.path_filter(property_path):
+                self.skip_property(type_name, size)
+                continue
+            yield name, self.property_stream(type_name, size, property_path)
+
+    def property_stream(self, type_name: str, size: int, path: str) -> dict[str, Any]:
+        """Like property(), but nested structs, map entries and struct array
+        elements are yielded lazily instead of being decoded up front.
+        Custom properties are always decoded eagerly."""
+        value: dict[str, Any]
+        if path in self.custom_properties:
+            return self.property(type_name, size, path)
         elif type_name == "StructProperty":
-            value = self.struct(path)
-        elif type_name == "IntProperty":
-            value = {
-                "id": self.optional_guid(),
-                "value": self.i32(),
-            }
-        elif type_name == "UInt16Property":
-            value = {
-                "id": self.optional_guid(),
-                "value": self.u16(),
-            }
-        elif type_name == "UInt32Property":
-            value = {
-                "id": self.optional_guid(),
-                "value": self.u32(),
-            }
-        elif type_name == "Int64Property":
-            value = {
-                "id": self.optional_guid(),
-                "value": self.i64(),
-            }
-        elif type_name == "FixedPoint64Property":
-            value = {
-                "id": self.optional_guid(),
-                "value": self.i32(),
-            }
-        elif type_name == "FloatProperty":
-            value = {
-                "id": self.optional_guid(),
-                "value": self.float(),
-            }
-        elif type_name == "StrProperty":
+            struct_type = self.fstring()
             value = {
+                "struct_type": struct_type,
+                "struct_id": self.guid(),
                 "id": self.optional_guid(),
-                "value": self.fstring(),
             }
-        elif type_name == "NameProperty":
-            value = {
-                "id": self.optional_guid(),
-                "value": self.fstring(),
-            }
-        elif type_name == "EnumProperty":
-            enum_type = self.fstring()
-            _id = self.optional_guid()
-            enum_value = self.fstring()
-            value = {
-                "id": _id,
-                "value": {
-                    "type": enum_type,
-                    "value": enum_value,
-                },
-            }
-        elif type_name == "BoolProperty":
-            value = {
-                "value": self.bool(),
-                "id": self.optional_guid(),
-            }
-        elif type_name == "ByteProperty":
-            enum_type = self.fstring()
-            _id = self.optional_guid()
-            if enum_type == "None":
-                enum_value = self.byte()
+            if struct_type in FArchiveReader._struct_value_readers:
+                value["value"] = self.struct_value(struct_type, path)
             else:
-                enum_value = self.fstring()
-            value = {
-                "id": _id,
-                "value": {
-                    "type": enum_type,
-                    "value": enum_value,
-                },
-            }
+                value["value"] = self.properties_stream(path)
         elif type_name == "ArrayProperty":
             array_type = self.fstring()
             value = {
                 "array_type": array_type,
                 "id": self.optional_guid(),
-                "value": self.array_property(array_type, size - 4, path),
             }
+            if array_type == "StructProperty":
+                count = self.u32()
+                prop_name = self.fstring()
+                prop_type = self.fstring()
+                self.u64()
+                struct_type = self.fstring()
+                struct_id = self.guid()
+                self.skip(1)
+                value["value"] = {
+                    "prop_name": prop_name,
+                    "prop_type": prop_type,
+                    "values": self._struct_values_stream(
+                        struct_type, count, self.paths[path][prop_name]
+                    ),
+                    "type_name": struct_type,
+                    "id": struct_id,
+                }
+            else:
+                value["value"] = self.array_property(array_type, size - 4, path)
         elif type_name == "MapProperty":
             key_type = self.fstring()
             value_type = self.fstring()
             _id = self.optional_guid()
             self.u32()
             count = self.u32()
-            key_path = path + ".Key"
+            child_paths = self.paths[path]
+            key_path = child_paths["Key"]
             if key_type == "StructProperty":
                 key_struct_type = self.get_type_or(key_path, "Guid")
             else:
                 key_struct_type = None
-            value_path = path + ".Value"
+            value_path = child_paths["Value"]
             if value_type == "StructProperty":
                 value_struct_type = self.get_type_or(value_path, "StructProperty")
             else:
                 value_struct_type = None
-            values: list[dict[str, Any]] = []
-            for _ in range(count):
-                key = self.prop_value(key_type, key_struct_type, key_path)
-                value = self.prop_value(value_type, value_struct_type, value_path)
-                values.append(
-                    {
-                        "key": key,
-                        "value": value,
-                    }
-                )
             value = {
                 "key_type": key_type,
                 "value_type": value_type,
                 "key_struct_type": key_struct_type,
                 "value_struct_type": value_struct_type,
                 "id": _id,
-                "value": values,
+                "value": self._map_entries_stream(
+                    count,
+                    key_type,
+                    key_struct_type,
+                    key_path,
+                    value_type,
+                    value_struct_type,
+                    value_path,
+                ),
             }
         else:
-            raise Exception(f"Unknown type: {type_name} ({path})")
+            return self.property(type_name, size, path)
         value["type"] = type_name
         return value
 
+    def _struct_values_stream(
+        self, type_name: str, count: int, path: str
+    ) -> Iterator[Any]:
+        for _ in range(count):
+            yield self.struct_value(type_name, path)
+
+    def _map_entries_stream(
+        self,
+        count: int,
+        key_type: str,
+        key_struct_type: str,
+        key_path: str,
+        value_type: str,
+        value_struct_type: str,
+        value_path: str,
+    ) -> Iterator[dict[str, Any]]:
+        for _ in range(count):
+            key = self.prop_value(key_type, key_struct_type, key_path)
+            value = self.prop_value(value_type, value_struct_type, value_path)
+            yield {
+                "key": key,
+                "value": value,
+            }
+
+    def property(
+        self, type_name: str, size: int, path: str, nested_caller_path: str = ""
+    ) -> dict[str, Any]:
+        if path in self.custom_properties and (
+            path is not nested_caller_path or nested_caller_path == ""
+        ):
+            # Custom decoders read their whole subtree up front
+            lazy = self.lazy
+            path_filter = self.path_filter
+            property_readers = self.property_readers
+            self.lazy = False
+            self.path_filter = None
+            self.property_readers = FArchiveReader._property_readers
+            try:
+                value = self.custom_properties[path][0](self, type_name, size, path)
+            finally:
+                self.lazy = lazy
+                self.path_filter = path_filter
+                self.property_readers = property_readers
+            value["custom_type"] = path
+            value["type"] = type_name
+            return value
+        read_property = self.property_readers.get(type_name)
+        if read_property is None:
+            raise Exception(f"Unknown type: {type_name} ({path})")
+        return read_property(self, size, path)
+
+    def _struct_property(self, size: int, path: str) -> dict[str, Any]:
+        value = self.struct(path)
+        value["type"] = "StructProperty"
+        return value
+
+    def _float_property(self, size: int, path: str) -> dict[str, Any]:
+        return {
+            "id": self.optional_guid(),
+            "value": self.float(),
+            "type": "FloatProperty",
+        }
+
+    def _enum_property(self, size: int, path: str) -> dict[str, Any]:
+        enum_type = self.fstring()
+        _id = self.optional_guid()
+        enum_value = self.fstring()
+        return {
+            "id": _id,
+            "value": {
+                "type": enum_type,
+                "value": enum_value,
+            },
+            "type": "EnumProperty",
+        }
+
+    def _bool_property(self, size: int, path: str) -> dict[str, Any]:
+        return {
+            "value": self.bool(),
+            "id": self.optional_guid(),
+            "type": "BoolProperty",
+        }
+
+    def _byte_property(self, size: int, path: str) -> dict[str, Any]:
+        enum_type = self.fstring()
+        _id = self.optional_guid()
+        enum_value: Union[int, str]
+        if enum_type == "None":
+            enum_value = self.byte()
+        else:
+            enum_value = self.fstring()
+        return {
+            "id": _id,
+            "value": {
+                "type": enum_type,
+                "value": enum_value,
+            },
+            "type": "ByteProperty",
+        }
+
+    def _array_property(self, size: int, path: str) -> dict[str, Any]:
+        array_type = self.fstring()
+        return {
+            "array_type": array_type,
+            "id": self.optional_guid(),
+            "value": self.array_property(array_type, size - 4, path),
+            "type": "ArrayProperty",
+        }
+
+    def _map_property(self, size: int, path: str) -> dict[str, Any]:
+        key_type, value_type, key_struct_type, value_struct_type, _id, values = (
+            self._map_property_fields(path)
+        )
+        return {
+            "key_type": key_type,
+            "value_type": value_type,
+            "key_struct_type": key_struct_type,
+            "value_struct_type": value_struct_type,
+            "id": _id,
+            "value": values,
+            "type": "MapProperty",
+        }
+
+    def _map_property_fields(self, path: str) -> tuple[Any, ...]:
+        key_type = self.fstring()
+        value_type = self.fstring()
+        _id = self.optional_guid()
+        self.u32()
+        count = self.u32()
+        child_paths = self.paths[path]
+        key_path = child_paths["Key"]
+        if key_type == "StructProperty":
+            key_struct_type = self.get_type_or(key_path, "Guid")
+        else:
+            key_struct_type = None
+        value_path = child_paths["Value"]
+        if value_type == "StructProperty":
+            value_struct_type = self.get_type_or(value_path, "StructProperty")
+        else:
+            value_struct_type = None
+        # Resolve both value readers once rather than per entry
+        read_key = self._prop_value_reader(key_type, key_struct_type, key_path)
+        read_value = self._prop_value_reader(value_type, value_struct_type, value_path)
+        values: list[dict[str, Any]] = []
+        for _ in range(count):
+            key = read_key()
+            value = read_value()
+            values.append(
+                {
+                    "key": key,
+                    "value": value,
+                }
+            )
+        return key_type, value_type, key_struct_type, value_struct_type, _id, values
+
+    # Compact counterparts of the decoders above, building the PropertyNode
+    # for each property directly
+
+    def _compact_struct_property(self, size: int, path: str) -> StructProp:
+        struct_type = self.fstring()
+        struct_id = self.guid()
+        _id = self.optional_guid()
+        return StructProp(
+            struct_type, struct_id, _id, self.struct_value(struct_type, path)
+        )
+
+    def _compact_float_property(self, size: int, path: str) -> FloatProp:
+        return FloatProp(self.optional_guid(), self.float())
+
+    def _compact_enum_property(self, size: int, path: str) -> EnumProp:
+        enum_type = self.fstring()
+        _id = self.optional_guid()
+        enum_value = self.fstring()
+        return EnumProp(_id, {"type": enum_type, "value": enum_value})
+
+    def _compact_bool_property(self, size: int, path: str) -> BoolProp:
+        return BoolProp(self.bool(), self.optional_guid())
+
+    def _compact_byte_property(self, size: int, path: str) -> ByteProp:
+        enum_type = self.fstring()
+        _id = self.optional_guid()
+        enum_value: Union[int, str]
+        if enum_type == "None":
+            enum_value = self.byte()
+        else:
+            enum_value = self.fstring()
+        return ByteProp(_id, {"type": enum_type, "value": enum_value})
+
+    def _compact_array_property(self, size: int, path: str) -> ArrayProp:
+        array_type = self.fstring()
+        return ArrayProp(
+            array_type,
+            self.optional_guid(),
+            self.array_property(array_type, size - 4, path),
+        )
+
+    def _compact_map_property(self, size: int, path: str) -> MapProp:
+        return MapProp(*self._map_property_fields(path))
+
+    # Decoders for each property type, called as reader(self, size, path)
+    _property_readers: dict[
+        str, Callable[["FArchiveReader", int, str], dict[str, Any]]
+    ] = {
+        "StructProperty": _struct_property,
+        "IntProperty": _optional_guid_and(unpack_i32, 4, "IntProperty"),
+        "UInt16Property": _optional_guid_and(unpack_u16, 2, "UInt16Property"),
+        "UInt32Property": _optional_guid_and(unpack_u32, 4, "UInt32Property"),
+        "Int64Property": _optional_guid_and(unpack_i64, 8, "Int64Property"),
+        "FixedPoint64Property": _optional_guid_and(
+            unpack_i32, 4, "FixedPoint64Property"
+        ),
+        "FloatProperty": _float_property,
+        "StrProperty": _optional_guid_and_fstring("StrProperty"),
+        "NameProperty": _optional_guid_and_fstring("NameProperty"),
+        "EnumProperty": _enum_property,
+        "BoolProperty": _bool_property,
+        "ByteProperty": _byte_property,
+        "ArrayProperty": _array_property,
+        "MapProperty": _map_property,
+    }
+    _compact_property_readers: dict[
+        str, Callable[["FArchiveReader", int, str], PropertyNode]
+    ] = {
+        "StructProperty": _compact_struct_property,
+        "IntProperty": _optional_guid_and(unpack_i32, 4, "IntProperty", IntProp),
+        "UInt16Property": _optional_guid_and(
+            unpack_u16, 2, "UInt16Property", UInt16Prop
+        ),
+        "UInt32Property": _optional_guid_and(
+            unpack_u32, 4, "UInt32Property", UInt32Prop
+        ),
+        "Int64Property": _optional_guid_and(unpack_i64, 8, "Int64Property", Int64Prop),
+        "FixedPoint64Property": _optional_guid_and(
+            unpack_i32, 4, "FixedPoint64Property", FixedPoint64Prop
+        ),
+        "FloatProperty": _compact_float_property,
+        "StrProperty": _optional_guid_and_fstring("StrProperty", StrProp),
+        "NameProperty": _optional_guid_and_fstring("NameProperty", NameProp),
+        "EnumProperty": _compact_enum_property,
+        "BoolProperty": _compact_bool_property,
+        "ByteProperty": _compact_byte_property,
+        "ArrayProperty": _compact_array_property,
+        "MapProperty": _compact_map_property,
+    }
+
     def prop_value(self, type_name: str, struct_type_name: str, path: str):
+        return self._prop_value_reader(type_name, struct_type_name, path)()
+
+    def _prop_value_reader(
+        self, type_name: str, struct_type_name: Optional[str], path: str
+    ) -> Callable[[], Any]:
         if type_name == "StructProperty":
-            return self.struct_value(struct_type_name, path)
-        elif type_name == "EnumProperty":
-            return self.fstring()
-        elif type_name == "NameProperty":
-            return self.fstring()
-        elif type_name == "IntProperty":
-            return self.i32()
-        elif type_name == "BoolProperty":
-            return self.bool()
-        else:
+            return lambda: self.struct_value(struct_type_name, path)  # type: ignore[arg-type]
+        read_value = FArchiveReader._prop_value_readers.get(type_name)
+        if read_value is None:
             raise Exception(f"Unknown property value type: {type_name} ({path})")
+        return read_value.__get__(self)
 
     def struct(self, path: str) -> dict[str, Any]:
         struct_type = self.fstring()
@@ -540,25 +1572,20 @@ class FArchiveReader:
         }
 
     def struct_value(self, struct_type: str, path: str = ""):
-        if struct_type == "Vector":
-            return self.vector_dict()
-        elif struct_type == "DateTime":
-            return self.u64()
-        elif struct_type == "Guid":
-            return self.guid()
-        elif struct_type == "Quat":
-            return self.quat_dict()
-        elif struct_type == "LinearColor":
-            return {
-                "r": self.float(),
-                "g": self.float(),
-                "b": self.float(),
-                "a": self.float(),
-            }
-        else:
-            if self.debug:
-                print(f"Assuming struct type: {struct_type} ({path})")
-            return self.properties_until_end(path)
+        read_struct = FArchiveReader._struct_value_readers.get(struct_type)
+        if read_struct is not None:
+            return read_struct(self)
+        if self.debug:
+            print(f"Assuming struct type: {struct_type} ({path})")
+        return self.properties_until_end(path)
+
+    def linear_color_dict(self) -> dict[str, Optional[_float]]:
+        return {
+            "r": self.float(),
+            "g": self.float(),
+            "b": self.float(),
+            "a": self.float(),
+        }
 
     def array_property(self, array_type: str, size: int, path: str):
         count = self.u32()
@@ -570,9 +1597,14 @@ class FArchiveReader:
             type_name = self.fstring()
             _id = self.guid()
             self.skip(1)
-            prop_values = []
-            for _ in range(count):
-                prop_values.append(self.struct_value(type_name, f"{path}.{prop_name}"))
+            packed = FArchiveReader._packed_structs.get(type_name)
+            if packed is not None:
+                prop_values = self.packed_struct_values(*packed, count)
+            else:
+                prop_values = []
+                prop_path = self.paths[path][prop_name]
+                for _ in range(count):
+                    prop_values.append(self.struct_value(type_name, prop_path))
             value = {
                 "prop_name": prop_name,
                 "prop_type": prop_type,
@@ -586,27 +1618,31 @@ class FArchiveReader:
             }
         return value
 
+    def packed_struct_values(
+        self, layout: _Struct, keys: tuple[str, ...], count: int
+    ) -> list[dict[str, Optional[_float]]]:
+        pos = self.pos
+        end = pos + layout.size * count
+        values = layout.iter_unpack(self.data[pos:end])
+        self.pos = end
+        if self.allow_nan:
+            return [dict(zip(keys, value)) for value in values]
+        non_finite_to_none = self.non_finite_to_none
+        return [dict(zip(keys, non_finite_to_none(value))) for value in values]
+
     def array_value(self, array_type: str, count: int, size: int, path: str):
-        values = []
-        decode_func: Callable
-        if array_type == "EnumProperty":
-            decode_func = self.fstring
-        elif array_type == "NameProperty":
-            decode_func = self.fstring
-        elif array_type == "Guid":
-            decode_func = self.guid
-        elif array_type == "ByteProperty":
+        if array_type == "ByteProperty":
             if size == count:
-                # Special case this and read faster in one go
-                return self.byte_list(count)
+                # Raw byte blobs are kept as bytes rather than a list of ints
+                return self.read(count)
             else:
                 raise Exception("Labelled ByteProperty not implemented")
-        else:
+        if array_type == "Guid":
+            return self.guids(count)
+        read_value = FArchiveReader._array_value_readers.get(array_type)
+        if read_value is None:
             raise Exception(f"Unknown array type: {array_type} ({path})")
-        for _ in range(count):
-            values.append(decode_func())
-
-        return values
+        return [read_value(self) for _ in range(count)]
 
     def compressed_short_rotator(self) -> tuple[_float, _float, _float]:
         short_pitch = self.u16() if self.bool() else 0
@@ -649,36 +1685,86 @@ class FArchiveReader:
             else:
                 return (self.float(), self.float(), self.float())
 
+    def non_finite_to_none(self, values: tuple[_float, ...]) -> tuple[Any, ...]:
+        """Applies the allow_nan handling of float() and double() to a batch
+        of values."""
+        if self.allow_nan or all(map(isfinite, values)):
+            return values
+        return tuple(val if isfinite(val) else None for val in values)
+
+    unpack_vector = _Struct("<3d").unpack_from
+    unpack_quat = _Struct("<4d").unpack_from
+    unpack_ftransform = _Struct("<10d").unpack_from
+
     def vector(self) -> tuple[Optional[_float], Optional[_float], Optional[_float]]:
-        return (self.double(), self.double(), self.double())
+        pos = self.pos
+        self.pos = pos + 24
+        return self.non_finite_to_none(FArchiveReader.unpack_vector(self.data, pos))
 
     def vector_dict(self) -> dict[str, Optional[_float]]:
+        x, y, z = self.vector()
         return {
-            "x": self.double(),
-            "y": self.double(),
-            "z": self.double(),
+            "x": x,
+            "y": y,
+            "z": z,
         }
 
     def quat(
         self,
     ) -> tuple[Optional[_float], Optional[_float], Optional[_float], Optional[_float]]:
-        return (self.double(), self.double(), self.double(), self.double())
+        pos = self.pos
+        self.pos = pos + 32
+        return self.non_finite_to_none(FArchiveReader.unpack_quat(self.data, pos))
 
     def quat_dict(self) -> dict[str, Optional[_float]]:
+        x, y, z, w = self.quat()
         return {
-            "x": self.double(),
-            "y": self.double(),
-            "z": self.double(),
-            "w": self.double(),
+            "x": x,
+            "y": y,
+            "z": z,
+            "w": w,
         }
 
     def ftransform(self) -> dict[str, dict[str, Optional[_float]]]:
+        pos = self.pos
+        self.pos = pos + 80
+        rx, ry, rz, rw, tx, ty, tz, sx, sy, sz = self.non_finite_to_none(
+            FArchiveReader.unpack_ftransform(self.data, pos)
+        )
         return {
-            "rotation": self.quat_dict(),
-            "translation": self.vector_dict(),
-            "scale3d": self.vector_dict(),
+            "rotation": {"x": rx, "y": ry, "z": rz, "w": rw},
+            "translation": {"x": tx, "y": ty, "z": tz},
+            "scale3d": {"x": sx, "y": sy, "z": sz},
         }
 
+    # Struct types made of floats only, with their layout and keys, which
+    # arrays unpack in one pass
+    _packed_structs: dict[str, tuple[_Struct, tuple[str, ...]]] = {
+        "Vector": (_Struct("<3d"), ("x", "y", "z")),
+        "Quat": (_Struct("<4d"), ("x", "y", "z", "w")),
+        "LinearColor": (_Struct("<4f"), ("r", "g", "b", "a")),
+    }
+    # Fixed layout structs, any other struct type is read as properties
+    _struct_value_readers: dict[str, Callable[["FArchiveReader"], Any]] = {
+        "Vector": vector_dict,
+        "DateTime": u64,
+        "Guid": guid,
+        "Quat": quat_dict,
+        "LinearColor": linear_color_dict,
+    }
+    # Map keys and values other than structs
+    _prop_value_readers: dict[str, Callable[["FArchiveReader"], Any]] = {
+        "EnumProperty": fstring,
+        "NameProperty": fstring,
+        "IntProperty": i32,
+        "BoolProperty": bool,
+    }
+    # Array elements other than structs, GUIDs and raw bytes
+    _array_value_readers: dict[str, Callable[["FArchiveReader"], Any]] = {
+        "EnumProperty": fstring,
+        "NameProperty": fstring,
+    }
+
 
 def uuid_writer(writer, s: Union[str, uuid.UUID, UUID]):
     if isinstance(s, str):
@@ -741,11 +1827,7 @@ class FArchiveWriter:
         return FArchiveWriter(self.custom_properties)
 
     def bytes(self) -> bytes:
-        pos = self.data.tell()
-        self.data.seek(0)
-        b = self.data.read()
-        self.data.seek(pos)
-        return b
+        return self.data.getvalue()
 
     def write(self, data: _bytes):
         self.data.write(data)
@@ -754,21 +1836,18 @@ class FArchiveWriter:
         self.data.write(struct.pack("?", bool))
 
     def fstring(self, string: str) -> int:
-        start = self.data.tell()
-        if string == "":
-            self.i32(0)
-        elif string.isascii():
-            str_bytes = string.encode("ascii")
-            self.i32(len(str_bytes) + 1)
-            self.data.write(str_bytes)
-            self.data.write(b"\x00")
-        else:
-            str_bytes = string.encode("utf-16-le", errors="surrogatepass")
-            assert len(str_bytes) % 2 == 0
-            self.i32(-((len(str_bytes) // 2) + 1))
-            self.data.write(str_bytes)
-            self.data.write(b"\x00\x00")
-        return self.data.tell() - start
+        # Property names, types and enum values repeat throughout a save, so
+        # each is encoded once and written in a single call
+        encoded = _encoded_fstring_cache.get(string)
+        if encoded is None:
+            encoded = encode_fstring(string)
+            if (
+                len(encoded) <= FSTRING_CACHE_MAX_LENGTH
+                and len(_encoded_fstring_cache) < FSTRING_CACHE_SIZE
+            ):
+                _encoded_fstring_cache[string] = encoded
+        self.data.write(encoded)
+        return len(encoded)
 
     def i16(self, i: int):
         self.data.write(struct.pack("h", i))
@@ -788,6 +1867,38 @@ class FArchiveWriter:
     def u64(self, i: int):
         self.data.write(struct.pack("Q", i))
 
+    def reserve_u64(self) -> int:
+        """Writes a placeholder u64 and returns its position for patch_u64."""
+        pos = self.data.tell()
+        self.data.write(b"\x00" * 8)
+        return pos
+
+    def patch_u64(self, pos: int, i: int):
+        end = self.data.tell()
+        self.data.seek(pos)
+        self.data.write(struct.pack("Q", i))
+        self.data.seek(end)
+
+    def byte_array_property(
+        self,
+        property: dict[str, Any],
+        write_value: Callable[["FArchiveWriter", Any], None],
+    ) -> int:
+        """Writes the body of a ByteProperty ArrayProperty like property_inner,
+        with the bytes written by write_value(self, property["value"])
+        directly into this stream instead of encoded into a separate buffer
+        first. The byte count is patched in afterwards. Returns the size."""
+        self.fstring(property["array_type"])
+        self.optional_guid(property.get("id", None))
+        count_pos = self.data.tell()
+        self.data.write(b"\x00" * 4)
+        write_value(self, property["value"])
+        end = self.data.tell()
+        self.data.seek(count_pos)
+        self.data.write(struct.pack("I", end - count_pos - 4))
+        self.data.seek(end)
+        return end - count_pos
+
     def float(self, i: Optional[float]):
         if i is None:
             i = float("nan")
@@ -828,16 +1939,19 @@ class FArchiveWriter:
         self.fstring("None")
 
     def property(self, property: dict[str, Any]):
+        if type(property) is LazyProperty and property.unchanged():
+            # Never accessed or edited, so the original bytes are still valid
+            self.fstring(property.type_name)
+            self.u64(property.size)
+            self.write(property.raw())
+            return
         # write type_name
-        self.fstring(property["type"])
-        nested_writer = self.copy()
-        size: int
         property_type = property["type"]
-        size = nested_writer.property_inner(property_type, property)
-        buf = nested_writer.bytes()
-        # write size
-        self.u64(size)
-        self.write(buf)
+        self.fstring(property_type)
+        # reserve size, patched once the body is written
+        size_pos = self.reserve_u64()
+        size = self.property_inner(property_type, property)
+        self.patch_u64(size_pos, size)
 
     def property_inner(self, property_type: str, property: dict[str, Any]) -> int:
         if "custom_type" in property:
@@ -900,30 +2014,26 @@ class FArchiveWriter:
         elif property_type == "ArrayProperty":
             self.fstring(property["array_type"])
             self.optional_guid(property.get("id", None))
-            array_writer = self.copy()
-            array_writer.array_property(property["array_type"], property["value"])
-            array_buf = array_writer.bytes()
-            size = len(array_buf)
-            self.write(array_buf)
+            start = self.data.tell()
+            self.array_property(property["array_type"], property["value"])
+            size = self.data.tell() - start
         elif property_type == "MapProperty":
             self.fstring(property["key_type"])
             self.fstring(property["value_type"])
             self.optional_guid(property.get("id", None))
-            map_writer = self.copy()
-            map_writer.u32(0)
-            map_writer.u32(len(property["value"]))
-            for entry in property["value"]:
-                map_writer.prop_value(
-                    property["key_type"], property["key_struct_type"], entry["key"]
-                )
-                map_writer.prop_value(
-                    property["value_type"],
-                    property["value_struct_type"],
-                    entry["value"],
-                )
-            map_buf = map_writer.bytes()
-            size = len(map_buf)
-            self.write(map_buf)
+            start = self.data.tell()
+            self.u32(0)
+            # Read each key once, property may parse them on every access
+            values = property["value"]
+            key_type = property["key_type"]
+            key_struct_type = property["key_struct_type"]
+            value_type = property["value_type"]
+            value_struct_type = property["value_struct_type"]
+            self.u32(len(values))
+            for entry in values:
+                self.prop_value(key_type, key_struct_type, entry["key"])
+                self.prop_value(value_type, value_struct_type, entry["value"])
+            size = self.data.tell() - start
         else:
             raise Exception(f"Unknown property type: {property_type}")
         return size
@@ -970,45 +2080,65 @@ class FArchiveWriter:
             raise Exception(f"Unknown property value type: {type_name}")
 
     def array_property(self, array_type: str, value: dict[str, Any]):
-        count = len(value["values"])
+        values = value["values"]
+        if array_type == "ByteProperty" and isinstance(values, str):
+            # Raw byte blobs are serialised to JSON as base64
+            values = base64.b64decode(values)
+        count = len(values)
         self.u32(count)
         if array_type == "StructProperty":
             self.fstring(value["prop_name"])
             self.fstring(value["prop_type"])
-            nested_writer = self.copy()
-            for i in range(count):
-                nested_writer.struct_value(value["type_name"], value["values"][i])
-            data_buf = nested_writer.bytes()
-            self.u64(len(data_buf))
-            self.fstring(value["type_name"])
+            size_pos = self.reserve_u64()
+            type_name = value["type_name"]
+            self.fstring(type_name)
             self.guid(value["id"])
             self.u(0)
-            self.write(data_buf)
+            start = self.data.tell()
+            for struct_value in values:
+                self.struct_value(type_name, struct_value)
+            self.patch_u64(size_pos, self.data.tell() - start)
         else:
-            self.array_value(array_type, count, value["values"])
-
-    def array_value(self, array_type: str, count: int, values: list[Any]):
-        for i in range(count):
-            if array_type == "IntProperty":
-                self.i32(values[i])
-            elif array_type == "UInt32Property":
-                self.u32(values[i])
-            elif array_type == "Int64Property":
-                self.i64(values[i])
-            elif array_type == "FloatProperty":
-                self.float(values[i])
-            elif array_type == "StrProperty":
-                self.fstring(values[i])
-            elif array_type == "NameProperty":
-                self.fstring(values[i])
-            elif array_type == "EnumProperty":
-                self.fstring(values[i])
-            elif array_type == "BoolProperty":
-                self.bool(values[i])
-            elif array_type == "ByteProperty":
-                self.byte(values[i])
-            else:
-                raise Exception(f"Unknown array type: {array_type}")
+            self.array_value(array_type, count, values)
+
+    def array_value(self, array_type: str, count: int, values: Sequence[Any]):
+        packed = FArchiveWriter._packed_arrays.get(array_type)
+        if packed is not None:
+            self.data.write(self.packed_array(*packed, count, values))
+            return
+        write_value = FArchiveWriter._array_value_writers.get(array_type)
+        if write_value is None:
+            raise Exception(f"Unknown array type: {array_type}")
+        for v in values:
+            write_value(self, v)
+
+    @staticmethod
+    def packed_array(
+        item_format: str, typecodes: str, count: int, values: Sequence[Any]
+    ) -> Union[_bytes, bytearray, memoryview, array.array]:
+        """Returns count values as consecutive little-endian items of the
+        struct format character item_format. Bytes-like values (for bytes) and
+        array.array values with one of typecodes and the same item size are
+        returned as they are; anything else is packed in a single call."""
+        if isinstance(values, array.array):
+            if (
+                values.typecode in typecodes
+                and values.itemsize == struct.calcsize(item_format)
+                and sys.byteorder == "little"
+            ):
+                return values
+        elif item_format == "B":
+            if isinstance(values, (_bytes, bytearray, memoryview)):
+                return values
+            return _bytes(values)
+        try:
+            return struct.pack(f"<{count}{item_format}", *values)
+        except struct.error:
+            if item_format != "f" or None not in values:
+                raise
+        # Floats converted to null on read are written back as NaN
+        values = [float("nan") if v is None else v for v in values]
+        return struct.pack(f"<{count}{item_format}", *values)
 
     def compressed_short_rotator(self, pitch: _float, yaw: _float, roll: _float):
         short_pitch = round(pitch * (65536.0 / 360.0)) & 0xFFFF
@@ -1119,3 +2249,21 @@ class FArchiveWriter:
         self.quat_dict(value["rotation"])
         self.vector_dict(value["translation"])
         self.vector_dict(value["scale3d"])
+
+    # Numeric arrays are packed in one go, as (struct format, array.array
+    # typecodes that can be written as they are)
+    _packed_arrays: dict[str, tuple[str, str]] = {
+        "ByteProperty": ("B", "bB"),
+        "IntProperty": ("i", "il"),
+        "UInt32Property": ("I", "IL"),
+        "Int64Property": ("q", "lq"),
+        "FloatProperty": ("f", "f"),
+    }
+    # Other array elements, except structs
+    _array_value_writers: dict[str, Callable[["FArchiveWriter", Any], Any]] = {
+        "StrProperty": fstring,
+        "NameProperty": fstring,
+        "EnumProperty": fstring,
+        "BoolProperty": bool,
+        "Guid": guid,
+    }
@@ -1,12 +1,17 @@
 #!/usr/bin/env python3
 
 import argparse
-import json
 import os
+import zlib
 
+from palworld_save_tools.archive import PathFilter
 from palworld_save_tools.gvas import GvasFile
-from palworld_save_tools.json_tools import CustomEncoder
-from palworld_save_tools.palsav import compress_gvas_to_sav, decompress_sav_to_gvas
+from palworld_save_tools.json_tools import dump_stream, load_stream
+from palworld_save_tools.palsav import (
+    FAST_SAVE_LEVELS,
+    compress_gvas_to_sav,
+    decompress_sav_to_gvas,
+)
 from palworld_save_tools.paltypes import (
     DISABLED_PROPERTIES,
     PALWORLD_CUSTOM_PROPERTIES,
@@ -46,12 +51,51 @@ def main():
         action="store_true",
         help="Convert NaN/Inf/-Inf floats to null when converting from SAV to JSON. This will lose information in the event Inf/-Inf is in the sav file (default: false)",
     )
+    parser.add_argument(
+        "--byte-lists",
+        action="store_true",
+        help="Write byte arrays as lists of integers instead of base64 strings when converting from SAV to JSON, matching the format of older versions (default: false)",
+    )
     parser.add_argument(
         "--custom-properties",
         default=",".join(set(PALWORLD_CUSTOM_PROPERTIES.keys()) - DISABLED_PROPERTIES),
         type=lambda t: [s.strip() for s in t.split(",")],
         help="Comma-separated list of custom properties to decode, or 'all' for all known properties. This can be used to speed up processing by excluding properties that are not of interest. (default: all)",
     )
+    parser.add_argument(
+        "--include",
+        type=lambda t: [s.strip() for s in t.split(",")],
+        help="Comma-separated list of property paths to decode when converting from SAV to JSON, e.g. 'worldSaveData.GroupSaveDataMap'. Paths are matched segment by segment with glob patterns. Other properties are skipped without being decoded, so the resulting JSON cannot be converted back to SAV. (default: all)",
+    )
+    parser.add_argument(
+        "--exclude",
+        type=lambda t: [s.strip() for s in t.split(",")],
+        help="Comma-separated list of property paths to skip when converting from SAV to JSON, using the same patterns as --include. The resulting JSON cannot be converted back to SAV. (default: none)",
+    )
+    parser.add_argument(
+        "--workers",
+        "-j",
+        type=int,
+        default=1,
+        help="Number of processes used to decode raw data when converting from SAV to JSON, or threads used to compress when converting from JSON to SAV (default: 1)",
+    )
+    parser.add_argument(
+        "--compression-level",
+        type=int,
+        choices=range(-1, 10),
+        help="zlib compression level (0-9) used when converting from JSON to SAV (default: -1, zlib's default)",
+    )
+    parser.add_argument(
+        "--outer-compression-level",
+        type=int,
+        choices=range(-1, 10),
+        help="zlib compression level for the second compression pass of double-compressed saves (default: same as --compression-level)",
+    )
+    parser.add_argument(
+        "--fast-save",
+        action="store_true",
+        help=f"Trade file size for speed when converting from JSON to SAV, same as --compression-level {FAST_SAVE_LEVELS[0]} --outer-compression-level {FAST_SAVE_LEVELS[1]}. Levels given explicitly take precedence",
+    )
 
     parser.add_argument("--minify-json", action="store_true", help="Minify JSON output")
     args = parser.parse_args()
@@ -79,6 +123,10 @@ def main():
             minify=args.minify_json,
             allow_nan=(not args.convert_nan_to_null),
             custom_properties_keys=args.custom_properties,
+            include=args.include,
+            exclude=args.exclude,
+            workers=args.workers,
+            byte_lists=args.byte_lists,
         )
 
     if args.from_json or args.filename.endswith(".json"):
@@ -86,7 +134,24 @@ def main():
             output_path = args.filename.replace(".json", "")
         else:
             output_path = args.output
-        convert_json_to_sav(args.filename, output_path, force=args.force)
+        level = args.compression_level
+        outer_level = args.outer_compression_level
+        if args.fast_save:
+            # Only fill in the levels that were not given explicitly
+            if level is None:
+                level = FAST_SAVE_LEVELS[0]
+            if outer_level is None:
+                outer_level = FAST_SAVE_LEVELS[1]
+        if level is None:
+            level = zlib.Z_DEFAULT_COMPRESSION
+        convert_json_to_sav(
+            args.filename,
+            output_path,
+            force=args.force,
+            level=level,
+            outer_level=outer_level,
+            threads=args.workers,
+        )
 
 
 def convert_sav_to_json(
@@ -96,6 +161,10 @@ def convert_sav_to_json(
     minify=False,
     allow_nan=True,
     custom_properties_keys=["all"],
+    include=None,
+    exclude=None,
+    workers=1,
+    byte_lists=False,
 ):
     print(f"Converting {filename} to JSON, saving to {output_path}")
     if os.path.exists(output_path):
@@ -104,9 +173,7 @@ def convert_sav_to_json(
             if not confirm_prompt("Are you sure you want to continue?"):
                 exit(1)
     print(f"Decompressing sav file")
-    with open(filename, "rb") as f:
-        data = f.read()
-        raw_gvas, _ = decompress_sav_to_gvas(data)
+    raw_gvas, _ = decompress_sav_to_gvas(filename)
     print(f"Loading GVAS file")
     custom_properties = {}
     if len(custom_properties_keys) > 0 and custom_properties_keys[0] == "all":
@@ -115,18 +182,40 @@ def convert_sav_to_json(
         for prop in PALWORLD_CUSTOM_PROPERTIES:
             if prop in custom_properties_keys:
                 custom_properties[prop] = PALWORLD_CUSTOM_PROPERTIES[prop]
-    gvas_file = GvasFile.read(
-        raw_gvas, PALWORLD_TYPE_HINTS, custom_properties, allow_nan=allow_nan
+    path_filter = None
+    if include is not None or exclude is not None:
+        print(
+            "WARNING: Only writing selected properties, the JSON file cannot be converted back to a SAV file"
+        )
+        path_filter = PathFilter(include, exclude)
+    gvas_stream = GvasFile.stream(
+        raw_gvas,
+        PALWORLD_TYPE_HINTS,
+        custom_properties,
+        allow_nan=allow_nan,
+        path_filter=path_filter,
+        workers=workers,
     )
     print(f"Writing JSON to {output_path}")
     with open(output_path, "w", encoding="utf8") as f:
         indent = None if minify else "\t"
-        json.dump(
-            gvas_file.dump(), f, indent=indent, cls=CustomEncoder, allow_nan=allow_nan
+        dump_stream(
+            gvas_stream,
+            f,
+            indent=indent,
+            allow_nan=allow_nan,
+            byte_lists=byte_lists,
         )
 
 
-def convert_json_to_sav(filename, output_path, force=False):
+def convert_json_to_sav(
+    filename,
+    output_path,
+    force=False,
+    level=zlib.Z_DEFAULT_COMPRESSION,
+    outer_level=None,
+    threads=1,
+):
     print(f"Converting {filename} to SAV, saving to {output_path}")
     if os.path.exists(output_path):
         print(f"{output_path} already exists, this will overwrite the file")
@@ -134,9 +223,14 @@ def convert_json_to_sav(filename, output_path, force=False):
             if not confirm_prompt("Are you sure you want to continue?"):
                 exit(1)
     print(f"Loading JSON from {filename}")
-    with open(filename, "r", encoding="utf8") as f:
-        data = json.load(f)
+    with open(filename, "rb") as f:
+        data = load_stream(f)
     gvas_file = GvasFile.load(data)
+    if gvas_file.filtered:
+        print(
+            f"{filename} was written with --include/--exclude and is missing properties, cannot convert it to SAV"
+        )
+        exit(1)
     print(f"Compressing SAV file")
     if (
         "Pal.PalWorldSaveGame" in gvas_file.header.save_game_class_name
@@ -146,7 +240,11 @@ def convert_json_to_sav(filename, output_path, force=False):
     else:
         save_type = 0x31
     sav_file = compress_gvas_to_sav(
-        gvas_file.write(PALWORLD_CUSTOM_PROPERTIES), save_type
+        gvas_file.write(PALWORLD_CUSTOM_PROPERTIES),
+        save_type,
+        level=level,
+        outer_level=outer_level,
+        threads=threads,
     )
     print(f"Writing SAV file to {output_path}")
     with open(output_path, "wb") as f:
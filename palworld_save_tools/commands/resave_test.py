@@ -28,12 +28,8 @@ def main():
     )
     convert_json_to_sav(output_json_path, output_sav_path)
     print(f"Comparing {input_path} and {output_sav_path}...")
-    with open(input_path, "rb") as f:
-        input_bytes = f.read()
-        original_gvas = decompress_sav_to_gvas(input_bytes)
-    with open(output_sav_path, "rb") as f:
-        output_bytes = f.read()
-        resaved_gvas = decompress_sav_to_gvas(output_bytes)
+    original_gvas = decompress_sav_to_gvas(input_path)
+    resaved_gvas = decompress_sav_to_gvas(output_sav_path)
     if original_gvas == resaved_gvas:
         print("Files are the same!")
     else:
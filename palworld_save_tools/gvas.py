@@ -1,7 +1,15 @@
 import base64
-from typing import Any, Callable
+import contextlib
+from concurrent.futures import Executor, ProcessPoolExecutor
+from typing import Any, Callable, ContextManager, Iterator, Optional
 
-from palworld_save_tools.archive import FArchiveReader, FArchiveWriter
+from palworld_save_tools.archive import (
+    FArchiveReader,
+    FArchiveWriter,
+    PathFilter,
+    PropertyStream,
+    to_dicts,
+)
 
 
 def custom_version_reader(reader: FArchiveReader):
@@ -13,6 +21,12 @@ def custom_version_writer(writer: FArchiveWriter, value: tuple[str, int]):
     writer.i32(value[1])
 
 
+def worker_pool(workers: int) -> ContextManager[Optional[Executor]]:
+    if workers > 1:
+        return ProcessPoolExecutor(workers)
+    return contextlib.nullcontext()
+
+
 class GvasHeader:
     magic: int
     save_game_version: int
@@ -112,6 +126,10 @@ class GvasFile:
     header: GvasHeader
     properties: dict[str, Any]
     trailer: bytes
+    # Whether properties may hold PropertyNode objects, see read()
+    compact: bool = False
+    # Whether a path filter left properties out, see read()
+    filtered: bool = False
 
     @staticmethod
     def read(
@@ -119,41 +137,128 @@ class GvasFile:
         type_hints: dict[str, str] = {},
         custom_properties: dict[str, tuple[Callable, Callable]] = {},
         allow_nan: bool = True,
+        lazy: bool = False,
+        path_filter: Optional[PathFilter] = None,
+        workers: int = 1,
+        compact: bool = False,
     ) -> "GvasFile":
+        """Reads a GVAS file. With lazy=True, property bodies are only decoded
+        when first accessed, and properties that were not edited since they
+        were read are written back byte for byte, so writing costs roughly in
+        proportion to the edits (see archive.LazyProperty). Properties
+        rejected by path_filter are skipped and left out entirely, so a
+        filtered file cannot be written: write() raises, and dump() marks the
+        result so that a file loaded from it cannot be written either. With
+        workers > 1, large custom properties decode their raw data in that
+        many processes while the file is read; lazily loaded properties are
+        decoded serially.
+        With compact=True, properties outside custom properties are decoded
+        into slotted archive.PropertyNode objects instead of dicts, which use
+        far less memory and can be edited and written the same way; dump()
+        converts them back to dicts."""
         gvas_file = GvasFile()
-        with FArchiveReader(
-            data,
-            type_hints=type_hints,
-            custom_properties=custom_properties,
-            allow_nan=allow_nan,
-        ) as reader:
+        with worker_pool(workers) as executor:
+            reader = FArchiveReader(
+                data,
+                type_hints=type_hints,
+                custom_properties=custom_properties,
+                allow_nan=allow_nan,
+                lazy=lazy,
+                path_filter=path_filter,
+                executor=executor,
+                compact=compact,
+            )
+            gvas_file.compact = compact
+            gvas_file.filtered = path_filter is not None
             gvas_file.header = GvasHeader.read(reader)
             gvas_file.properties = reader.properties_until_end()
             gvas_file.trailer = reader.read_to_end()
-            if gvas_file.trailer != b"\x00\x00\x00\x00":
-                print(
-                    f"{len(gvas_file.trailer)} bytes of trailer data, file may not have fully parsed"
-                )
+            reader.executor = None
+        if gvas_file.trailer != b"\x00\x00\x00\x00":
+            print(
+                f"{len(gvas_file.trailer)} bytes of trailer data, file may not have fully parsed"
+            )
+        if not lazy:
+            reader.data.release()
         return gvas_file
 
+    @staticmethod
+    def stream(
+        data: bytes,
+        type_hints: dict[str, str] = {},
+        custom_properties: dict[str, tuple[Callable, Callable]] = {},
+        allow_nan: bool = True,
+        path_filter: Optional[PathFilter] = None,
+        workers: int = 1,
+    ) -> PropertyStream:
+        """Returns the same structure as GvasFile.read(...).dump(), decoding
+        properties lazily as the stream is consumed (e.g. by
+        json_tools.dump_stream), so the full property tree is never held in
+        memory at once."""
+        return PropertyStream(
+            GvasFile._stream(
+                data, type_hints, custom_properties, allow_nan, path_filter, workers
+            )
+        )
+
+    @staticmethod
+    def _stream(
+        data: bytes,
+        type_hints: dict[str, str],
+        custom_properties: dict[str, tuple[Callable, Callable]],
+        allow_nan: bool,
+        path_filter: Optional[PathFilter],
+        workers: int,
+    ) -> Iterator[tuple[str, Any]]:
+        with worker_pool(workers) as executor:
+            with FArchiveReader(
+                data,
+                type_hints=type_hints,
+                custom_properties=custom_properties,
+                allow_nan=allow_nan,
+                path_filter=path_filter,
+                executor=executor,
+            ) as reader:
+                yield "header", GvasHeader.read(reader).dump()
+                yield "properties", reader.properties_stream()
+                trailer = reader.read_to_end()
+                if trailer != b"\x00\x00\x00\x00":
+                    print(
+                        f"{len(trailer)} bytes of trailer data, file may not have fully parsed"
+                    )
+                yield "trailer", base64.b64encode(trailer).decode("utf-8")
+                if path_filter is not None:
+                    yield "filtered", True
+
     @staticmethod
     def load(dict: dict[str, Any]) -> "GvasFile":
         gvas_file = GvasFile()
         gvas_file.header = GvasHeader.load(dict["header"])
         gvas_file.properties = dict["properties"]
         gvas_file.trailer = base64.b64decode(dict["trailer"])
+        gvas_file.filtered = dict.get("filtered", False)
         return gvas_file
 
     def dump(self) -> dict[str, Any]:
-        return {
+        properties = self.properties
+        if self.compact:
+            properties = to_dicts(properties)
+        dump: dict[str, Any] = {
             "header": self.header.dump(),
-            "properties": self.properties,
+            "properties": properties,
             "trailer": base64.b64encode(self.trailer).decode("utf-8"),
         }
+        if self.filtered:
+            dump["filtered"] = True
+        return dump
 
     def write(
         self, custom_properties: dict[str, tuple[Callable, Callable]] = {}
     ) -> bytes:
+        if self.filtered:
+            raise Exception(
+                "Properties were skipped by a path filter, cannot write an incomplete save"
+            )
         writer = FArchiveWriter(custom_properties)
         self.header.write(writer)
         writer.properties(self.properties)
@@ -1,13 +1,454 @@
+import array
+import base64
+import io
 import json
+import math
+import mmap
+import re
 import uuid
+from collections.abc import Mapping, Sequence
+from json.encoder import encode_basestring_ascii  # type: ignore[attr-defined]
+from typing import Any, BinaryIO, Generator, Iterator, Optional, TextIO, Union
 
-from palworld_save_tools.archive import UUID
+from palworld_save_tools.archive import UUID, LazyProperty, PropertyNode
 
 
 class CustomEncoder(json.JSONEncoder):
+    """JSON encoder for decoded save data.
+
+    Byte blobs are written as base64 strings. Pass byte_lists=True to write
+    them as lists of ints instead, as older versions did.
+    """
+
+    def __init__(self, *args, byte_lists: bool = False, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.byte_lists = byte_lists
+
     def default(self, obj):
         if isinstance(obj, UUID):
             return str(obj)
         if isinstance(obj, uuid.UUID):
             return str(obj)
+        if isinstance(obj, (bytes, bytearray, memoryview)):
+            if self.byte_lists:
+                return list(obj)
+            return base64.b64encode(obj).decode("ascii")
+        if isinstance(obj, LazyProperty):
+            return obj.peek()
+        if isinstance(obj, PropertyNode):
+            return obj.to_dict()
         return super(CustomEncoder, self).default(obj)
+
+
+def dump_stream(
+    obj: Any,
+    fp: TextIO,
+    indent: Optional[Union[int, str]] = None,
+    allow_nan: bool = True,
+    buffer_chunks: int = 8192,
+    byte_lists: bool = False,
+) -> None:
+    """Writes obj to fp as JSON, producing the same output as
+    json.dump(obj, fp, indent=indent, allow_nan=allow_nan, cls=CustomEncoder,
+    byte_lists=byte_lists).
+
+    Output is written incrementally, holding at most buffer_chunks encoded
+    chunks in memory. Besides dicts and lists, obj may contain lazy values,
+    which are consumed as they are reached: objects with an items() method
+    (such as PropertyStream) are written as JSON objects, and other iterators
+    (such as generators) are written as JSON arrays.
+    """
+    encoder = CustomEncoder(allow_nan=allow_nan, byte_lists=byte_lists)
+    if isinstance(indent, int):
+        indent = " " * indent
+    item_separator = ", " if indent is None else ","
+    key_separator = ": "
+    buf: list[str] = []
+    append = buf.append
+
+    def flush() -> None:
+        fp.write("".join(buf))
+        buf.clear()
+
+    def floatstr(o: float) -> str:
+        if o != o:
+            text = "NaN"
+        elif o == math.inf:
+            text = "Infinity"
+        elif o == -math.inf:
+            text = "-Infinity"
+        else:
+            return float.__repr__(o)
+        if not allow_nan:
+            raise ValueError(
+                "Out of range float values are not JSON compliant: " + repr(o)
+            )
+        return text
+
+    def encode_key(key: Any) -> str:
+        if isinstance(key, str):
+            return encode_basestring_ascii(key)
+        elif isinstance(key, float):
+            return '"' + floatstr(key) + '"'
+        elif key is True:
+            return '"true"'
+        elif key is False:
+            return '"false"'
+        elif key is None:
+            return '"null"'
+        elif isinstance(key, int):
+            return '"' + int.__repr__(key) + '"'
+        raise TypeError(
+            f"keys must be str, int, float, bool or None, not {key.__class__.__name__}"
+        )
+
+    def encode(o: Any, level: int) -> None:
+        if isinstance(o, str):
+            append(encode_basestring_ascii(o))
+        elif o is None:
+            append("null")
+        elif o is True:
+            append("true")
+        elif o is False:
+            append("false")
+        elif isinstance(o, int):
+            append(int.__repr__(o))
+        elif isinstance(o, float):
+            append(floatstr(o))
+        elif isinstance(o, (UUID, uuid.UUID)):
+            # UUID strings never need escaping
+            append('"' + str(o) + '"')
+        elif isinstance(o, (list, tuple)):
+            encode_array(o, level)
+        elif isinstance(o, dict):
+            encode_object(o.items(), level)
+        elif isinstance(o, LazyProperty):
+            # Read through peek() so the property is not marked as modified
+            encode_object(o.peek().items(), level)
+        elif hasattr(o, "items"):
+            encode_object(o.items(), level)
+        elif hasattr(o, "__next__"):
+            encode_array(o, level)
+        else:
+            encode(encoder.default(o), level)
+
+    def encode_array(values: Any, level: int) -> None:
+        if indent is not None:
+            level += 1
+            newline_indent = "\n" + indent * level
+            separator = item_separator + newline_indent
+        else:
+            newline_indent = ""
+            separator = item_separator
+        append("[")
+        first = True
+        for value in values:
+            if first:
+                append(newline_indent)
+                first = False
+            else:
+                append(separator)
+            encode(value, level)
+            if len(buf) >= buffer_chunks:
+                flush()
+        if not first and indent is not None:
+            append("\n" + indent * (level - 1))
+        append("]")
+
+    def encode_object(items: Any, level: int) -> None:
+        if indent is not None:
+            level += 1
+            newline_indent = "\n" + indent * level
+            separator = item_separator + newline_indent
+        else:
+            newline_indent = ""
+            separator = item_separator
+        append("{")
+        first = True
+        for key, value in items:
+            if first:
+                append(newline_indent)
+                first = False
+            else:
+                append(separator)
+            append(encode_key(key))
+            append(key_separator)
+            encode(value, level)
+            if len(buf) >= buffer_chunks:
+                flush()
+        if not first and indent is not None:
+            append("\n" + indent * (level - 1))
+        append("}")
+
+    encode(obj, 0)
+    flush()
+
+
+_JSON_DECODER = json.JSONDecoder()
+_JSON_WHITESPACE = re.compile(r"[ \t\n\r]*")
+_JSON_STRING = re.compile(rb'"(?:[^"\\]|\\.)*"', re.DOTALL)
+# Placeholder for values too large to decode while scanning their parent
+_LARGE = object()
+
+
+class _JSONWindow:
+    """A decoded window over a JSON byte buffer, refilled as it is advanced so
+    that at least threshold bytes past the current position are available."""
+
+    __slots__ = ("buf", "threshold", "text", "index", "pos", "end", "ascii")
+
+    def __init__(self, buf: Any, pos: int, threshold: int) -> None:
+        self.buf = buf
+        self.threshold = threshold
+        self.fill(pos)
+
+    def fill(self, pos: int) -> None:
+        self.end = min(len(self.buf), pos + 2 * self.threshold)
+        self.text = str(self.buf[pos : self.end], "utf-8", "surrogateescape")
+        self.ascii = len(self.text) == self.end - pos
+        self.index = 0
+        self.pos = pos
+
+    def advance(self, index: int) -> None:
+        if self.ascii:
+            self.pos += index - self.index
+        else:
+            self.pos += len(
+                self.text[self.index : index].encode("utf-8", "surrogateescape")
+            )
+        self.index = index
+        if len(self.text) - index < self.threshold and self.end < len(self.buf):
+            self.fill(self.pos)
+
+    def skip_whitespace(self) -> str:
+        """Skips whitespace and returns the next character."""
+        index = _JSON_WHITESPACE.match(self.text, self.index).end()  # type: ignore[union-attr]
+        if index != self.index:
+            self.advance(index)
+        if self.index >= len(self.text):
+            raise ValueError(f"Unexpected end of JSON at offset {self.pos}")
+        return self.text[self.index]
+
+    def decode(self) -> Any:
+        """Decodes the value at the current position, or returns _LARGE
+        without advancing if it does not fit in the window."""
+        try:
+            value, index = _JSON_DECODER.raw_decode(self.text, self.index)
+        except json.JSONDecodeError:
+            if self.end == len(self.buf):
+                raise
+            return _LARGE
+        self.advance(index)
+        return value
+
+
+def _scan_container(
+    buf: Any, start: int, threshold: int
+) -> Generator[tuple[Optional[str], int, int, Any], None, int]:
+    """Yields (key, value start, value end, value) for each direct child of the
+    JSON object or array starting at buf[start], and returns the offset just
+    past it. Keys are None for array elements, and values of at least
+    threshold bytes are returned as _LARGE without being decoded."""
+    window = _JSONWindow(buf, start, threshold)
+    is_object = window.text[0] == "{"
+    window.advance(1)
+    c = window.skip_whitespace()
+    if c == "}" or c == "]":
+        window.advance(window.index + 1)
+        return window.pos
+    while True:
+        key = None
+        if is_object:
+            key = window.decode()
+            if not isinstance(key, str):
+                raise ValueError(f"Expected object key at offset {window.pos}")
+            if window.skip_whitespace() != ":":
+                raise ValueError(f"Expected ':' at offset {window.pos}")
+            window.advance(window.index + 1)
+            window.skip_whitespace()
+        value_start = window.pos
+        value = window.decode()
+        if value is _LARGE:
+            window.fill(_value_end(buf, value_start, threshold))
+        yield key, value_start, window.pos, value
+        c = window.skip_whitespace()
+        window.advance(window.index + 1)
+        if c == ",":
+            window.skip_whitespace()
+        elif c == "}" or c == "]":
+            return window.pos
+        else:
+            raise ValueError(f"Expected ',' or closing bracket at offset {window.pos}")
+
+
+def _value_end(buf: Any, start: int, threshold: int) -> int:
+    c = buf[start : start + 1]
+    if c == b"{" or c == b"[":
+        children = _scan_container(buf, start, threshold)
+        while True:
+            try:
+                next(children)
+            except StopIteration as e:
+                return e.value
+    match = _JSON_STRING.match(buf, start)
+    if match is None:
+        raise ValueError(f"Invalid JSON value at offset {start}")
+    return match.end()
+
+
+def _lazy_value(
+    buf: Any, start: int, end: int, threshold: int, whole_entries: bool = False
+) -> Any:
+    if end - start >= threshold:
+        c = buf[start : start + 1]
+        if c == b"{":
+            return LazyJSONObject.parse(buf, start, threshold, whole_entries)
+        if c == b"[":
+            return LazyJSONArray(buf, start, threshold, whole_entries)
+    return json.loads(buf[start:end])
+
+
+class LazyJSONObject(Mapping):
+    """A JSON object whose large values are only parsed when accessed.
+
+    Parsed values are never cached, so walking the tree once keeps at most
+    one path of large values in memory. Only the lazy objects and arrays
+    returned for large values are kept, as they hold nothing but offsets,
+    so they are not scanned again. With whole_entries, array elements below
+    this object are always parsed in full, see LazyJSONArray."""
+
+    __slots__ = ("buf", "spans", "threshold", "whole_entries", "children")
+
+    def __init__(
+        self,
+        buf: Any,
+        spans: dict[str, tuple[int, int]],
+        threshold: int,
+        whole_entries: bool = False,
+    ) -> None:
+        self.buf = buf
+        self.spans = spans
+        self.threshold = threshold
+        self.whole_entries = whole_entries
+        self.children: dict[str, Any] = {}
+
+    @staticmethod
+    def parse(buf: Any, start: int, threshold: int, whole_entries: bool = False) -> Any:
+        spans = {}
+        for key, value_start, value_end, _ in _scan_container(buf, start, threshold):
+            spans[key] = (value_start, value_end)
+        if "custom_type" in spans:
+            # Custom property encoders delete "custom_type" and edit the
+            # entries of their arrays in place before writing them, so hand
+            # them a dict and plain entries
+            return {
+                key: _lazy_value(buf, s, e, threshold, True)
+                for key, (s, e) in spans.items()
+            }
+        return LazyJSONObject(buf, spans, threshold, whole_entries)  # type: ignore[arg-type]
+
+    def __getitem__(self, key: str) -> Any:
+        value = self.children.get(key)
+        if value is not None:
+            return value
+        start, end = self.spans[key]
+        value = _lazy_value(self.buf, start, end, self.threshold, self.whole_entries)
+        if isinstance(value, (LazyJSONObject, LazyJSONArray)):
+            self.children[key] = value
+        return value
+
+    def __contains__(self, key: object) -> bool:
+        return key in self.spans
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.spans)
+
+    def __len__(self) -> int:
+        return len(self.spans)
+
+
+class LazyJSONArray(Sequence):
+    """A JSON array whose elements are parsed one at a time as it is
+    iterated, and parsed again on every access. The offsets of the elements
+    are kept once the array has been scanned, so later iterations, len()
+    and indexing do not scan it again. With whole_entries, large elements
+    are parsed in full as well, so they are plain dicts and lists that can
+    be edited."""
+
+    __slots__ = ("buf", "start", "threshold", "whole_entries", "offsets")
+
+    def __init__(
+        self, buf: Any, start: int, threshold: int, whole_entries: bool = False
+    ) -> None:
+        self.buf = buf
+        self.start = start
+        self.threshold = threshold
+        self.whole_entries = whole_entries
+        # Start and end offset of each element, once scanned
+        self.offsets: Optional[array.array] = None
+
+    def _element(self, start: int, end: int) -> Any:
+        if self.whole_entries:
+            return json.loads(self.buf[start:end])
+        return _lazy_value(self.buf, start, end, self.threshold)
+
+    def __iter__(self) -> Iterator[Any]:
+        offsets = self.offsets
+        if offsets is not None:
+            for i in range(0, len(offsets), 2):
+                yield self._element(offsets[i], offsets[i + 1])
+            return
+        offsets = array.array("q")
+        for _, start, end, value in _scan_container(
+            self.buf, self.start, self.threshold
+        ):
+            offsets.append(start)
+            offsets.append(end)
+            if value is _LARGE:
+                value = self._element(start, end)
+            yield value
+        self.offsets = offsets
+
+    def _scan(self) -> array.array:
+        if self.offsets is None:
+            offsets = array.array("q")
+            for _, start, end, _ in _scan_container(
+                self.buf, self.start, self.threshold
+            ):
+                offsets.append(start)
+                offsets.append(end)
+            self.offsets = offsets
+        return self.offsets
+
+    def __len__(self) -> int:
+        return len(self._scan()) // 2
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return list(self)[index]
+        offsets = self._scan()
+        if index < 0:
+            index += len(offsets) // 2
+        if not 0 <= index < len(offsets) // 2:
+            raise IndexError("list index out of range")
+        return self._element(offsets[2 * index], offsets[2 * index + 1])
+
+
+def load_stream(fp: BinaryIO, lazy_threshold: int = 1024 * 1024) -> Any:
+    """Loads JSON from a binary file, parsing objects and arrays of at least
+    lazy_threshold bytes on demand rather than up front.
+
+    The file is memory mapped where possible, so a large document can be
+    walked (e.g. by GvasFile.load(...).write()) without holding the whole
+    parsed tree in memory. Below objects containing a "custom_type" key, which
+    custom property encoders edit while writing them, each array element is
+    parsed in full, so the largest such element (e.g. one map object) bounds
+    the memory used."""
+    buf: Any
+    try:
+        buf = mmap.mmap(fp.fileno(), 0, access=mmap.ACCESS_READ)
+    except (AttributeError, OSError, ValueError, io.UnsupportedOperation):
+        buf = fp.read()
+    head = buf[:64]
+    start = len(head) - len(head.lstrip())
+    return _lazy_value(buf, start, len(buf), lazy_threshold)
@@ -1,9 +1,88 @@
+import contextlib
+import io
+import mmap
+import os
+import queue
+import threading
 import zlib
+from concurrent.futures import ThreadPoolExecutor
+from typing import (
+    Any,
+    BinaryIO,
+    Generator,
+    Iterable,
+    Iterator,
+    Optional,
+    TypeVar,
+    Union,
+)
 
 MAGIC_BYTES = b"PlZ"
 
+# Compression levels (inner, outer) used for fast saves. The outer pass of a
+# double compressed save barely shrinks the already compressed data, so it
+# is only stored.
+FAST_SAVE_LEVELS = (1, 0)
 
-def decompress_sav_to_gvas(data: bytes) -> tuple[bytes, int]:
+# Size of the pieces that are compressed in parallel, or handed between the
+# inner and outer zlib stages of double-compressed saves
+CHUNK_SIZE = 1024 * 1024
+# Each parallel chunk is primed with the tail of the previous one, so it
+# compresses as well as it would as part of a single stream
+ZLIB_WINDOW_SIZE = 32 * 1024
+# A zlib stream never inflates by more than this factor, so a buffer of the
+# uncompressed length in the header is only allocated up front while the
+# compressed data could plausibly fill it, and grown as output arrives past it
+MAX_ZLIB_RATIO = 1032
+
+T = TypeVar("T")
+
+SavSource = Union[bytes, bytearray, memoryview, str, os.PathLike, BinaryIO]
+
+
+@contextlib.contextmanager
+def open_sav(source: SavSource) -> Iterator[Any]:
+    """Yields the contents of a SAV file given as bytes, a path or a binary
+    file object. Files are memory mapped where possible, and unmapped on
+    exit."""
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        yield source
+        return
+    if isinstance(source, (str, os.PathLike)):
+        with open(source, "rb") as f:
+            with open_sav(f) as data:
+                yield data
+        return
+    try:
+        data = mmap.mmap(source.fileno(), 0, access=mmap.ACCESS_READ)
+    except (AttributeError, OSError, ValueError, io.UnsupportedOperation):
+        yield source.read()
+        return
+    try:
+        yield data
+    finally:
+        data.close()
+
+
+def decompress_sav_to_gvas(
+    source: SavSource, threads: int = 1
+) -> tuple[bytearray, int]:
+    """Decompresses a SAV file into GVAS data, returning it with the save type.
+
+    source may be the file contents, a path or a binary file object. Files
+    are memory mapped rather than read, and the GVAS data is decompressed
+    straight into a buffer of the size given in the header, so the
+    compressed data is never copied and is released before this returns.
+    That buffer is returned as is, so the GVAS data is a bytearray rather
+    than bytes; use bytes(...) on it where an immutable copy is needed.
+    Double-compressed (0x32) saves are decompressed as a stream, without
+    holding the intermediate zlib stream in memory. With threads > 1, the
+    outer and inner stages run concurrently."""
+    with open_sav(source) as data:
+        return _decompress_sav_to_gvas(data, threads)
+
+
+def _decompress_sav_to_gvas(data: Any, threads: int) -> tuple[bytearray, int]:
     uncompressed_len = int.from_bytes(data[0:4], byteorder="little")
     compressed_len = int.from_bytes(data[4:8], byteorder="little")
     magic_bytes = data[8:11]
@@ -39,26 +118,91 @@ def decompress_sav_to_gvas(data: bytes) -> tuple[bytes, int]:
         if compressed_len != len(data) - data_start_offset:
             raise Exception(f"incorrect compressed length: {compressed_len}")
     # Decompress file
-    uncompressed_data = zlib.decompress(data[data_start_offset:])
-    if save_type == 0x32:
-        # Check if the compressed length is correct
-        if compressed_len != len(uncompressed_data):
-            raise Exception(f"incorrect compressed length: {compressed_len}")
-        # Decompress file
-        uncompressed_data = zlib.decompress(uncompressed_data)
+    uncompressed_data = bytearray(
+        min(uncompressed_len, MAX_ZLIB_RATIO * (len(data) - data_start_offset))
+    )
+    uncompressed_pos = 0
+
+    def write(chunk: bytes) -> None:
+        nonlocal uncompressed_pos
+        end = uncompressed_pos + len(chunk)
+        if end > uncompressed_len:
+            raise Exception(f"incorrect uncompressed length: {uncompressed_len}")
+        # Extends the buffer if the chunk runs past its end
+        uncompressed_data[uncompressed_pos:end] = chunk
+        uncompressed_pos = end
+
+    with memoryview(data) as view:
+        compressed_data = view[data_start_offset:]
+        outer_chunks = decompress_chunks(compressed_data)
+        inner_chunks = outer_chunks
+        if threads > 1 and save_type == 0x32:
+            inner_chunks = threaded(outer_chunks)
+        try:
+            if save_type == 0x31:
+                for chunk in outer_chunks:
+                    write(chunk)
+            else:
+                inner_len = 0
+                inner = zlib.decompressobj()
+                for chunk in inner_chunks:
+                    inner_len += len(chunk)
+                    while chunk:
+                        write(inner.decompress(chunk, CHUNK_SIZE))
+                        chunk = inner.unconsumed_tail
+                write(inner.flush())
+                if not inner.eof:
+                    raise zlib.error("incomplete or truncated stream")
+                # Check if the compressed length is correct
+                if compressed_len != inner_len:
+                    raise Exception(f"incorrect compressed length: {compressed_len}")
+        finally:
+            # Drop every reference into the file before it is unmapped
+            inner_chunks.close()
+            outer_chunks.close()
+            compressed_data.release()
     # Check if the uncompressed length is correct
-    if uncompressed_len != len(uncompressed_data):
+    if uncompressed_len != uncompressed_pos:
         raise Exception(f"incorrect uncompressed length: {uncompressed_len}")
 
     return uncompressed_data, save_type
 
 
-def compress_gvas_to_sav(data: bytes, save_type: int) -> bytes:
+def compress_gvas_to_sav(
+    data: bytes,
+    save_type: int,
+    level: int = zlib.Z_DEFAULT_COMPRESSION,
+    strategy: int = zlib.Z_DEFAULT_STRATEGY,
+    threads: int = 1,
+    outer_level: Optional[int] = None,
+) -> bytes:
+    """Compresses GVAS data into a SAV file of the given save type.
+
+    level applies to the GVAS data itself. For double compressed (0x32)
+    saves, outer_level applies to the second pass over the already
+    compressed data, and defaults to level. With threads > 1, the data is
+    compressed in CHUNK_SIZE pieces in parallel (producing a different,
+    equally valid zlib stream), and for double compressed saves the outer
+    stage compresses pieces as they complete."""
     uncompressed_len = len(data)
-    compressed_data = zlib.compress(data)
-    compressed_len = len(compressed_data)
+    inner_chunks = compress_chunks(data, level, strategy, threads)
+    compressed_len = 0
+    compressed_chunks = []
     if save_type == 0x32:
-        compressed_data = zlib.compress(compressed_data)
+        if outer_level is None:
+            outer_level = level
+        outer = zlib.compressobj(
+            outer_level, zlib.DEFLATED, zlib.MAX_WBITS, 8, strategy
+        )
+        for chunk in inner_chunks:
+            compressed_len += len(chunk)
+            compressed_chunks.append(outer.compress(chunk))
+        compressed_chunks.append(outer.flush())
+    else:
+        for chunk in inner_chunks:
+            compressed_len += len(chunk)
+            compressed_chunks.append(chunk)
+    compressed_data = b"".join(compressed_chunks)
 
     # Create a byte array and append the necessary information
     result = bytearray()
@@ -69,3 +213,107 @@ def compress_gvas_to_sav(data: bytes, save_type: int) -> bytes:
     result.extend(compressed_data)
 
     return bytes(result)
+
+
+def decompress_chunks(data: memoryview) -> Generator[bytes, None, None]:
+    """Decompresses a zlib stream, yielding the output as it is produced."""
+    decompressor = zlib.decompressobj()
+    for start in range(0, len(data), CHUNK_SIZE):
+        tail: Union[memoryview, bytes] = data[start : start + CHUNK_SIZE]
+        while tail:
+            # Bound each output piece so highly compressible input does not
+            # inflate into one large buffer
+            chunk = decompressor.decompress(tail, CHUNK_SIZE)
+            if chunk:
+                yield chunk
+            tail = decompressor.unconsumed_tail
+    chunk = decompressor.flush()
+    if chunk:
+        yield chunk
+    if not decompressor.eof:
+        raise zlib.error("incomplete or truncated stream")
+
+
+def compress_chunks(
+    data: bytes, level: int, strategy: int, threads: int
+) -> Iterator[bytes]:
+    """Compresses data into a zlib stream, yielding it in pieces."""
+    if threads <= 1 or len(data) <= CHUNK_SIZE:
+        compressor = zlib.compressobj(level, zlib.DEFLATED, zlib.MAX_WBITS, 8, strategy)
+        yield compressor.compress(data)
+        yield compressor.flush()
+        return
+    view = memoryview(data)
+
+    def compress_chunk(start: int) -> bytes:
+        end = start + CHUNK_SIZE
+        dictionary = view[max(0, start - ZLIB_WINDOW_SIZE) : start].tobytes()
+        compressor = zlib.compressobj(
+            level, zlib.DEFLATED, -zlib.MAX_WBITS, 8, strategy, dictionary
+        )
+        compressed = compressor.compress(view[start:end])
+        if end >= len(view):
+            return compressed + compressor.flush(zlib.Z_FINISH)
+        # Sync flush ends the chunk on a byte boundary so the raw deflate
+        # streams can be concatenated
+        return compressed + compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    # zlib header, with the compression level hint zlib itself would use
+    if strategy >= zlib.Z_HUFFMAN_ONLY or 0 <= level < 2:
+        level_flag = 0
+    elif 0 <= level < 6:
+        level_flag = 1
+    elif level == 6 or level == zlib.Z_DEFAULT_COMPRESSION:
+        level_flag = 2
+    else:
+        level_flag = 3
+    header = 0x7800 | (level_flag << 6)
+    header += 31 - header % 31
+    with ThreadPoolExecutor(threads) as executor:
+        checksum = executor.submit(zlib.adler32, data)
+        chunks = [
+            executor.submit(compress_chunk, start)
+            for start in range(0, len(view), CHUNK_SIZE)
+        ]
+        yield header.to_bytes(2, byteorder="big")
+        for chunk in chunks:
+            yield chunk.result()
+        yield checksum.result().to_bytes(4, byteorder="big")
+
+
+def threaded(iterable: Iterable[T], maxsize: int = 8) -> Generator[T, None, None]:
+    """Runs iterable in a background thread, yielding its items as they are
+    produced. At most maxsize items are buffered."""
+    items: queue.Queue = queue.Queue(maxsize)
+    done = object()
+    stop = threading.Event()
+
+    def produce() -> None:
+        try:
+            for item in iterable:
+                if stop.is_set():
+                    return
+                items.put((item, None))
+        except BaseException as e:
+            items.put((done, e))
+            return
+        items.put((done, None))
+
+    thread = threading.Thread(target=produce, daemon=True)
+    thread.start()
+    try:
+        while True:
+            item, error = items.get()
+            if error is not None:
+                raise error
+            if item is done:
+                return
+            yield item
+    finally:
+        stop.set()
+        # Unblock the producer if it is waiting on a full queue
+        while thread.is_alive():
+            try:
+                items.get(timeout=0.1)
+            except queue.Empty:
+                pass
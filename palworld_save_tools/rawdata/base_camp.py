@@ -17,7 +17,7 @@ def decode(
 def decode_bytes(
     parent_reader: FArchiveReader, b_bytes: Sequence[int]
 ) -> dict[str, Any]:
-    reader = parent_reader.internal_copy(bytes(b_bytes), debug=False)
+    reader = parent_reader.sub_reader(b_bytes)
     data = {
         "id": reader.guid(),
         "name": reader.fstring(),
@@ -38,14 +38,16 @@ def encode(
 ) -> int:
     if property_type != "ArrayProperty":
         raise Exception(f"Expected ArrayProperty, got {property_type}")
-    del properties["custom_type"]
-    encoded_bytes = encode_bytes(properties["value"])
-    properties["value"] = {"values": [b for b in encoded_bytes]}
-    return writer.property_inner(property_type, properties)
+    return writer.byte_array_property(properties, write_bytes)
 
 
 def encode_bytes(p: dict[str, Any]) -> bytes:
     writer = FArchiveWriter()
+    write_bytes(writer, p)
+    return writer.bytes()
+
+
+def write_bytes(writer: FArchiveWriter, p: dict[str, Any]) -> None:
     writer.guid(p["id"])
     writer.fstring(p["name"])
     writer.byte(p["state"])
@@ -54,5 +56,3 @@ def encode_bytes(p: dict[str, Any]) -> bytes:
     writer.guid(p["group_id_belong_to"])
     writer.ftransform(p["fast_travel_local_transform"])
     writer.guid(p["owner_map_object_instance_id"])
-    encoded_bytes = writer.bytes()
-    return encoded_bytes
@@ -2,6 +2,8 @@ from typing import Any, Sequence
 
 from palworld_save_tools.archive import *
 from palworld_save_tools.rawdata.common import (
+    EncodedEntries,
+    decode_entries,
     pal_item_and_num_read,
     pal_item_and_slot_writer,
 )
@@ -24,12 +26,16 @@ def decode(
     value = reader.property(type_name, size, path, nested_caller_path=path)
     # module map
     module_map = value["value"]
-    for module in module_map:
-        module_type = module["key"]
-        module_bytes = module["value"]["RawData"]["value"]["values"]
-        module["value"]["RawData"]["value"] = decode_bytes(
-            reader, module_bytes, module_type
-        )
+    decoded = decode_entries(
+        reader,
+        decode_bytes,
+        [
+            (module["value"]["RawData"]["value"]["values"], module["key"])
+            for module in module_map
+        ],
+    )
+    for module, module_data in zip(module_map, decoded):
+        module["value"]["RawData"]["value"] = module_data
     return value
 
 
@@ -61,7 +67,7 @@ def module_passive_effect_reader(reader: FArchiveReader) -> dict[str, Any]:
 def decode_bytes(
     parent_reader: FArchiveReader, b_bytes: Sequence[int], module_type: str
 ) -> dict[str, Any]:
-    reader = parent_reader.internal_copy(bytes(b_bytes), debug=False)
+    reader = parent_reader.sub_reader(b_bytes)
     data: dict[str, Any] = {}
     if module_type in NO_OP_TYPES:
         pass
@@ -79,7 +85,7 @@ def decode_bytes(
         try:
             data["passive_effects"] = reader.tarray(module_passive_effect_reader)
         except Exception as e:
-            reader.data.seek(0)
+            reader.seek(0)
             print(
                 f"Warning: Failed to decode passive effect, please report this: {e} ({bytes(b_bytes)!r})"
             )
@@ -100,16 +106,20 @@ def encode(
     if property_type != "MapProperty":
         raise Exception(f"Expected MapProperty, got {property_type}")
     del properties["custom_type"]
+    encoded = {
+        **properties,
+        "value": EncodedEntries(properties["value"], encode_module),
+    }
+    return writer.property_inner(property_type, encoded)
 
-    module_map = properties["value"]
-    for module in module_map:
-        module_type = module["key"]
-        if "values" not in module["value"]["RawData"]["value"]:
-            module["value"]["RawData"]["value"]["values"] = encode_bytes(
-                module["value"]["RawData"]["value"], module_type
-            )
 
-    return writer.property_inner(property_type, properties)
+def encode_module(module: dict[str, Any]) -> dict[str, Any]:
+    module_type = module["key"]
+    if "values" not in module["value"]["RawData"]["value"]:
+        module["value"]["RawData"]["value"]["values"] = encode_bytes(
+            module["value"]["RawData"]["value"], module_type
+        )
+    return module
 
 
 def transport_item_character_info_writer(
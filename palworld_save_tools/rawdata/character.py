@@ -17,7 +17,7 @@ def decode(
 def decode_bytes(
     parent_reader: FArchiveReader, char_bytes: Sequence[int]
 ) -> dict[str, Any]:
-    reader = parent_reader.internal_copy(bytes(char_bytes), debug=False)
+    reader = parent_reader.sub_reader(char_bytes)
     char_data = {
         "object": reader.properties_until_end(),
         "unknown_bytes": reader.byte_list(4),
@@ -33,16 +33,16 @@ def encode(
 ) -> int:
     if property_type != "ArrayProperty":
         raise Exception(f"Expected ArrayProperty, got {property_type}")
-    del properties["custom_type"]
-    encoded_bytes = encode_bytes(properties["value"])
-    properties["value"] = {"values": [b for b in encoded_bytes]}
-    return writer.property_inner(property_type, properties)
+    return writer.byte_array_property(properties, write_bytes)
 
 
 def encode_bytes(p: dict[str, Any]) -> bytes:
     writer = FArchiveWriter()
+    write_bytes(writer, p)
+    return writer.bytes()
+
+
+def write_bytes(writer: FArchiveWriter, p: dict[str, Any]) -> None:
     writer.properties(p["object"])
     writer.write(bytes(p["unknown_bytes"]))
     writer.guid(p["group_id"])
-    encoded_bytes = writer.bytes()
-    return encoded_bytes
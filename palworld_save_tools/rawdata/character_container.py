@@ -19,7 +19,7 @@ def decode_bytes(
 ) -> Optional[dict[str, Any]]:
     if len(c_bytes) == 0:
         return None
-    reader = parent_reader.internal_copy(bytes(c_bytes), debug=False)
+    reader = parent_reader.sub_reader(c_bytes)
     data = {
         "player_uid": reader.guid(),
         "instance_id": reader.guid(),
@@ -35,18 +35,18 @@ def encode(
 ) -> int:
     if property_type != "ArrayProperty":
         raise Exception(f"Expected ArrayProperty, got {property_type}")
-    del properties["custom_type"]
-    encoded_bytes = encode_bytes(properties["value"])
-    properties["value"] = {"values": [b for b in encoded_bytes]}
-    return writer.property_inner(property_type, properties)
+    return writer.byte_array_property(properties, write_bytes)
 
 
 def encode_bytes(p: dict[str, Any]) -> bytes:
-    if p is None:
-        return bytes()
     writer = FArchiveWriter()
+    write_bytes(writer, p)
+    return writer.bytes()
+
+
+def write_bytes(writer: FArchiveWriter, p: dict[str, Any]) -> None:
+    if p is None:
+        return
     writer.guid(p["player_uid"])
     writer.guid(p["instance_id"])
     writer.byte(p["permission_tribe_id"])
-    encoded_bytes = writer.bytes()
-    return encoded_bytes
@@ -1,7 +1,11 @@
-from typing import Any
+from itertools import repeat
+from typing import Any, Callable, Iterator, Sequence
 
 from palworld_save_tools.archive import Any, FArchiveReader, FArchiveWriter
 
+# Number of entries sent to a worker process at a time by decode_entries
+PARALLEL_CHUNK_SIZE = 256
+
 
 def pal_item_and_num_read(reader: FArchiveReader) -> dict[str, Any]:
     return {
@@ -21,3 +25,58 @@ def pal_item_and_slot_writer(writer: FArchiveWriter, p: dict[str, Any]) -> None:
     writer.guid(p["item_id"]["dynamic_id"]["created_world_id"])
     writer.guid(p["item_id"]["dynamic_id"]["local_id_in_created_world"])
     writer.u32(p["num"])
+
+
+def decode_entries(
+    reader: FArchiveReader,
+    decoder: Callable[..., Any],
+    entries: Sequence[tuple],
+) -> list[Any]:
+    """Returns [decoder(reader, *entry) for entry in entries].
+
+    If the reader has an executor, the entries are decoded in chunks by its
+    worker processes, so decoder must be a module-level function and entries
+    must be picklable. Results are returned in order."""
+    executor = reader.executor
+    if executor is None or len(entries) <= PARALLEL_CHUNK_SIZE:
+        return [decoder(reader, *entry) for entry in entries]
+    chunks = [
+        entries[i : i + PARALLEL_CHUNK_SIZE]
+        for i in range(0, len(entries), PARALLEL_CHUNK_SIZE)
+    ]
+    reader_config = (reader.type_hints, reader.custom_properties, reader.allow_nan)
+    results: list[Any] = []
+    for chunk_results in executor.map(
+        _decode_chunk, repeat(decoder), repeat(reader_config), chunks
+    ):
+        results.extend(chunk_results)
+    return results
+
+
+class EncodedEntries:
+    """Applies encoder to each of entries as it is iterated, so that custom
+    property writers can hand entries to the generic writer one at a time
+    instead of rewriting them all up front. encoder returns the entry to
+    write, which may be the same object edited in place."""
+
+    __slots__ = ("entries", "encoder")
+
+    def __init__(self, entries: Sequence[Any], encoder: Callable[[Any], Any]) -> None:
+        self.entries = entries
+        self.encoder = encoder
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def __iter__(self) -> Iterator[Any]:
+        return map(self.encoder, self.entries)
+
+
+def _decode_chunk(
+    decoder: Callable[..., Any],
+    reader_config: tuple[dict[str, str], dict[str, tuple[Callable, Callable]], bool],
+    entries: Sequence[tuple],
+) -> list[Any]:
+    type_hints, custom_properties, allow_nan = reader_config
+    reader = FArchiveReader(b"", type_hints, custom_properties, allow_nan=allow_nan)
+    return [decoder(reader, *entry) for entry in entries]
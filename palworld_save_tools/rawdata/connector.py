@@ -31,7 +31,7 @@ def decode_bytes(
 ) -> Optional[dict[str, Any]]:
     if len(c_bytes) == 0:
         return {"values": []}
-    reader = parent_reader.internal_copy(bytes(c_bytes), debug=False)
+    reader = parent_reader.sub_reader(c_bytes)
     data: dict[str, Any] = {
         "supported_level": reader.i32(),
         "connect": {
@@ -63,16 +63,18 @@ def encode(
 ) -> int:
     if property_type != "ArrayProperty":
         raise Exception(f"Expected ArrayProperty, got {property_type}")
-    del properties["custom_type"]
-    encoded_bytes = encode_bytes(properties["value"])
-    properties["value"] = {"values": [b for b in encoded_bytes]}
-    return writer.property_inner(property_type, properties)
+    return writer.byte_array_property(properties, write_bytes)
 
 
 def encode_bytes(p: dict[str, Any]) -> bytes:
-    if p is None:
-        return bytes()
     writer = FArchiveWriter()
+    write_bytes(writer, p)
+    return writer.bytes()
+
+
+def write_bytes(writer: FArchiveWriter, p: dict[str, Any]) -> None:
+    if p is None:
+        return
     writer.i32(p["supported_level"])
     writer.byte(p["connect"]["index"])
     writer.tarray(connect_info_item_writer, p["connect"]["any_place"])
@@ -80,5 +82,3 @@ def encode_bytes(p: dict[str, Any]) -> bytes:
         for other in p["other_connectors"]:
             writer.byte(other["index"])
             writer.tarray(connect_info_item_writer, other["connect"])
-    encoded_bytes = writer.bytes()
-    return encoded_bytes
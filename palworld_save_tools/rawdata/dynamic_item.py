@@ -20,7 +20,7 @@ def decode_bytes(
     if len(c_bytes) == 0:
         return None
     buf = bytes(c_bytes)
-    reader = parent_reader.internal_copy(buf, debug=False)
+    reader = parent_reader.sub_reader(buf)
     data: dict[str, Any] = {}
     data["id"] = {
         "created_world_id": reader.guid(),
@@ -31,13 +31,13 @@ def decode_bytes(
     egg_data = try_read_egg(reader)
     if isinstance(egg_data, dict):
         data |= egg_data
-    elif (reader.size - reader.data.tell()) == 4:
+    elif (reader.size - reader.tell()) == 4:
         data["type"] = "armor"
         data["durability"] = reader.float()
         if not reader.eof():
             raise Exception("Warning: EOF not reached")
     else:
-        cur_pos = reader.data.tell()
+        cur_pos = reader.tell()
         temp_data: dict[str, Any] = {"type": "weapon"}
         try:
             temp_data["durability"] = reader.float()
@@ -50,13 +50,13 @@ def decode_bytes(
             print(
                 f"Warning: Failed to parse weapon data, continuing as raw data {buf!r}: {e}"
             )
-            reader.data.seek(cur_pos)
+            reader.seek(cur_pos)
             data["trailer"] = [int(b) for b in reader.read_to_end()]
     return data
 
 
 def try_read_egg(reader: FArchiveReader) -> Optional[dict[str, Any]]:
-    cur_pos = reader.data.tell()
+    cur_pos = reader.tell()
     try:
         data: dict[str, Any] = {"type": "egg"}
         data["character_id"] = reader.fstring()
@@ -69,7 +69,7 @@ def try_read_egg(reader: FArchiveReader) -> Optional[dict[str, Any]]:
     except Exception as e:
         if e.args[0] == "Warning: EOF not reached":
             raise e
-        reader.data.seek(cur_pos)
+        reader.seek(cur_pos)
         return None
 
 
@@ -78,16 +78,18 @@ def encode(
 ) -> int:
     if property_type != "ArrayProperty":
         raise Exception(f"Expected ArrayProperty, got {property_type}")
-    del properties["custom_type"]
-    encoded_bytes = encode_bytes(properties["value"])
-    properties["value"] = {"values": [b for b in encoded_bytes]}
-    return writer.property_inner(property_type, properties)
+    return writer.byte_array_property(properties, write_bytes)
 
 
 def encode_bytes(p: dict[str, Any]) -> bytes:
-    if p is None:
-        return bytes()
     writer = FArchiveWriter()
+    write_bytes(writer, p)
+    return writer.bytes()
+
+
+def write_bytes(writer: FArchiveWriter, p: dict[str, Any]) -> None:
+    if p is None:
+        return
     writer.guid(p["id"]["created_world_id"])
     writer.guid(p["id"]["local_id_in_created_world"])
     writer.fstring(p["id"]["static_id"])
@@ -104,5 +106,3 @@ def encode_bytes(p: dict[str, Any]) -> bytes:
         writer.float(p["durability"])
         writer.i32(p["remaining_bullets"])
         writer.tarray(lambda w, d: (w.fstring(d), None)[1], p["passive_skill_list"])
-    encoded_bytes = writer.bytes()
-    return encoded_bytes
@@ -17,7 +17,7 @@ def decode(
 def decode_bytes(
     parent_reader: FArchiveReader, b_bytes: Sequence[int]
 ) -> dict[str, Any]:
-    reader = parent_reader.internal_copy(bytes(b_bytes), debug=False)
+    reader = parent_reader.sub_reader(b_bytes)
     data: dict[str, Any] = {}
     data["model_id"] = reader.fstring()
     data["foliage_preset_type"] = reader.byte()
@@ -36,20 +36,18 @@ def encode(
 ) -> int:
     if property_type != "ArrayProperty":
         raise Exception(f"Expected ArrayProperty, got {property_type}")
-    del properties["custom_type"]
-    encoded_bytes = encode_bytes(properties["value"])
-    properties["value"] = {"values": [b for b in encoded_bytes]}
-    return writer.property_inner(property_type, properties)
+    return writer.byte_array_property(properties, write_bytes)
 
 
 def encode_bytes(p: dict[str, Any]) -> bytes:
     writer = FArchiveWriter()
+    write_bytes(writer, p)
+    return writer.bytes()
 
+
+def write_bytes(writer: FArchiveWriter, p: dict[str, Any]) -> None:
     writer.fstring(p["model_id"])
     writer.byte(p["foliage_preset_type"])
     writer.i64(p["cell_coord"]["x"])
     writer.i64(p["cell_coord"]["y"])
     writer.i64(p["cell_coord"]["z"])
-
-    encoded_bytes = writer.bytes()
-    return encoded_bytes
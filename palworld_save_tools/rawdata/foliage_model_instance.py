@@ -17,7 +17,7 @@ def decode(
 def decode_bytes(
     parent_reader: FArchiveReader, b_bytes: Sequence[int]
 ) -> dict[str, Any]:
-    reader = parent_reader.internal_copy(bytes(b_bytes), debug=False)
+    reader = parent_reader.sub_reader(b_bytes)
     data: dict[str, Any] = {}
     data["model_instance_id"] = reader.guid()
     pitch, yaw, roll = reader.compressed_short_rotator()
@@ -46,15 +46,16 @@ def encode(
 ) -> int:
     if property_type != "ArrayProperty":
         raise Exception(f"Expected ArrayProperty, got {property_type}")
-    del properties["custom_type"]
-    encoded_bytes = encode_bytes(properties["value"])
-    properties["value"] = {"values": [b for b in encoded_bytes]}
-    return writer.property_inner(property_type, properties)
+    return writer.byte_array_property(properties, write_bytes)
 
 
 def encode_bytes(p: dict[str, Any]) -> bytes:
     writer = FArchiveWriter()
+    write_bytes(writer, p)
+    return writer.bytes()
 
+
+def write_bytes(writer: FArchiveWriter, p: dict[str, Any]) -> None:
     writer.guid(p["model_instance_id"])
     writer.compressed_short_rotator(
         p["world_transform"]["rotator"]["pitch"],
@@ -69,6 +70,3 @@ def encode_bytes(p: dict[str, Any]) -> bytes:
     )
     writer.float(p["world_transform"]["scale_x"])
     writer.i32(p["hp"])
-
-    encoded_bytes = writer.bytes()
-    return encoded_bytes
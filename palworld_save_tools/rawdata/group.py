@@ -1,6 +1,7 @@
 from typing import Sequence
 
 from palworld_save_tools.archive import *
+from palworld_save_tools.rawdata.common import EncodedEntries
 
 
 def decode(
@@ -23,12 +24,12 @@ def decode(
 def decode_bytes(
     parent_reader: FArchiveReader, group_bytes: Sequence[int], group_type: str
 ) -> dict[str, Any]:
-    reader = parent_reader.internal_copy(bytes(group_bytes), debug=False)
+    reader = parent_reader.sub_reader(group_bytes)
     group_data = {
         "group_type": group_type,
         "group_id": reader.guid(),
         "group_name": reader.fstring(),
-        "individual_character_handle_ids": reader.tarray(instance_id_reader),
+        "individual_character_handle_ids": reader.instance_ids(reader.u32()),
     }
     if group_type in [
         "EPalGroupType::Guild",
@@ -37,13 +38,13 @@ def decode_bytes(
     ]:
         org = {
             "org_type": reader.byte(),
-            "base_ids": reader.tarray(uuid_reader),
+            "base_ids": reader.guids(reader.u32()),
         }
         group_data |= org
     if group_type in ["EPalGroupType::Guild", "EPalGroupType::IndependentGuild"]:
         guild: dict[str, Any] = {
             "base_camp_level": reader.i32(),
-            "map_object_instance_ids_base_camp_points": reader.tarray(uuid_reader),
+            "map_object_instance_ids_base_camp_points": reader.guids(reader.u32()),
             "guild_name": reader.fstring(),
         }
         group_data |= guild
@@ -84,14 +85,16 @@ def encode(
     if property_type != "MapProperty":
         raise Exception(f"Expected MapProperty, got {property_type}")
     del properties["custom_type"]
-    group_map = properties["value"]
-    for group in group_map:
-        if "values" in group["value"]["RawData"]["value"]:
-            continue
+    encoded = {**properties, "value": EncodedEntries(properties["value"], encode_group)}
+    return writer.property_inner(property_type, encoded)
+
+
+def encode_group(group: dict[str, Any]) -> dict[str, Any]:
+    if "values" not in group["value"]["RawData"]["value"]:
         p = group["value"]["RawData"]["value"]
         encoded_bytes = encode_bytes(p)
-        group["value"]["RawData"]["value"] = {"values": [b for b in encoded_bytes]}
-    return writer.property_inner(property_type, properties)
+        group["value"]["RawData"]["value"] = {"values": encoded_bytes}
+    return group
 
 
 def encode_bytes(p: dict[str, Any]) -> bytes:
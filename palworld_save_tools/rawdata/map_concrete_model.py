@@ -354,7 +354,7 @@ def decode_bytes(
 ) -> Optional[dict[str, Any]]:
     if len(m_bytes) == 0:
         return {"values": []}
-    reader = parent_reader.internal_copy(bytes(m_bytes), debug=False)
+    reader = parent_reader.sub_reader(m_bytes)
     data: dict[str, Any] = {}
 
     if object_id.lower() not in MAP_OBJECT_NAME_TO_CONCRETE_MODEL_CLASS:
@@ -452,7 +452,7 @@ def decode_bytes(
 
     if not reader.eof():
         raise Exception(
-            f"Warning: EOF not reached for {object_id} {map_object_concrete_model}: ori: {''.join(f'{b:02x}' for b in m_bytes)} remaining: {reader.size - reader.data.tell()}"
+            f"Warning: EOF not reached for {object_id} {map_object_concrete_model}: ori: {''.join(f'{b:02x}' for b in m_bytes)} remaining: {reader.size - reader.tell()}"
         )
     return data
 
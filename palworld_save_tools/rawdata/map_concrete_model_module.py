@@ -35,7 +35,7 @@ def decode_bytes(
 ) -> Optional[dict[str, Any]]:
     if len(m_bytes) == 0:
         return {"values": []}
-    reader = parent_reader.internal_copy(bytes(m_bytes), debug=False)
+    reader = parent_reader.sub_reader(m_bytes)
     data: dict[str, Any] = {}
 
     if module_type == "EPalMapObjectConcreteModelModuleType::ItemContainer":
@@ -17,7 +17,7 @@ def decode(
 def decode_bytes(
     parent_reader: FArchiveReader, m_bytes: Sequence[int]
 ) -> dict[str, Any]:
-    reader = parent_reader.internal_copy(bytes(m_bytes), debug=False)
+    reader = parent_reader.sub_reader(m_bytes)
     data: dict[str, Any] = {}
     data["instance_id"] = reader.guid()
     data["concrete_model_instance_id"] = reader.guid()
@@ -48,15 +48,16 @@ def encode(
 ) -> int:
     if property_type != "ArrayProperty":
         raise Exception(f"Expected ArrayProperty, got {property_type}")
-    del properties["custom_type"]
-    encoded_bytes = encode_bytes(properties["value"])
-    properties["value"] = {"values": [b for b in encoded_bytes]}
-    return writer.property_inner(property_type, properties)
+    return writer.byte_array_property(properties, write_bytes)
 
 
 def encode_bytes(p: dict[str, Any]) -> bytes:
     writer = FArchiveWriter()
+    write_bytes(writer, p)
+    return writer.bytes()
 
+
+def write_bytes(writer: FArchiveWriter, p: dict[str, Any]) -> None:
     writer.guid(p["instance_id"])
     writer.guid(p["concrete_model_instance_id"])
     writer.guid(p["base_camp_id_belong_to"])
@@ -78,6 +79,3 @@ def encode_bytes(p: dict[str, Any]) -> bytes:
     writer.u32(1 if p["stage_instance_id_belong_to"]["valid"] else 0)
 
     writer.i64(p["created_at"])
-
-    encoded_bytes = writer.bytes()
-    return encoded_bytes
@@ -8,6 +8,7 @@ from palworld_save_tools.rawdata import (
     map_concrete_model_module,
     map_model,
 )
+from palworld_save_tools.rawdata.common import EncodedEntries, decode_entries
 
 
 def decode(
@@ -16,113 +17,141 @@ def decode(
     if type_name != "ArrayProperty":
         raise Exception(f"Expected ArrayProperty, got {type_name}")
     value = reader.property(type_name, size, path, nested_caller_path=path)
-    for map_object in value["value"]["values"]:
-        # Decode Model
-        map_object["Model"]["value"]["RawData"]["value"] = map_model.decode_bytes(
-            reader, map_object["Model"]["value"]["RawData"]["value"]["values"]
-        )
-        # Decode Model.Connector
-        map_object["Model"]["value"]["Connector"]["value"]["RawData"]["value"] = (
-            connector.decode_bytes(
-                reader,
+    map_objects = value["value"]["values"]
+    decoded = decode_entries(
+        reader,
+        decode_map_object_bytes,
+        [
+            (
+                map_object["Model"]["value"]["RawData"]["value"]["values"],
                 map_object["Model"]["value"]["Connector"]["value"]["RawData"]["value"][
                     "values"
                 ],
-            )
-        )
-        # Decode Model.BuildProcess
-        map_object["Model"]["value"]["BuildProcess"]["value"]["RawData"]["value"] = (
-            build_process.decode_bytes(
-                reader,
                 map_object["Model"]["value"]["BuildProcess"]["value"]["RawData"][
                     "value"
                 ]["values"],
-            )
-        )
-        # Decode ConcreteModel
-        map_object_id = map_object["MapObjectId"]["value"]
-        map_object["ConcreteModel"]["value"]["RawData"]["value"] = (
-            map_concrete_model.decode_bytes(
-                reader,
                 map_object["ConcreteModel"]["value"]["RawData"]["value"]["values"],
-                map_object_id,
+                map_object["MapObjectId"]["value"],
+                [
+                    (module["key"], module["value"]["RawData"]["value"]["values"])
+                    for module in map_object["ConcreteModel"]["value"]["ModuleMap"][
+                        "value"
+                    ]
+                ],
             )
-        )
+            for map_object in map_objects
+        ],
+    )
+    for map_object, (
+        model,
+        connector_data,
+        build_process_data,
+        concrete,
+        modules,
+    ) in zip(map_objects, decoded):
+        # Decode Model
+        map_object["Model"]["value"]["RawData"]["value"] = model
+        # Decode Model.Connector
+        map_object["Model"]["value"]["Connector"]["value"]["RawData"][
+            "value"
+        ] = connector_data
+        # Decode Model.BuildProcess
+        map_object["Model"]["value"]["BuildProcess"]["value"]["RawData"][
+            "value"
+        ] = build_process_data
+        # Decode ConcreteModel
+        map_object["ConcreteModel"]["value"]["RawData"]["value"] = concrete
         # Decode ConcreteModel.ModuleMap
-        for module in map_object["ConcreteModel"]["value"]["ModuleMap"]["value"]:
-            module_type = module["key"]
-            module_bytes = module["value"]["RawData"]["value"]["values"]
-            module["value"]["RawData"]["value"] = (
-                map_concrete_model_module.decode_bytes(
-                    reader,
-                    module_bytes,
-                    module_type,
-                )
-            )
+        for module, module_data in zip(
+            map_object["ConcreteModel"]["value"]["ModuleMap"]["value"], modules
+        ):
+            module["value"]["RawData"]["value"] = module_data
     return value
 
 
+def decode_map_object_bytes(
+    reader: FArchiveReader,
+    model_bytes: Sequence[int],
+    connector_bytes: Sequence[int],
+    build_process_bytes: Sequence[int],
+    concrete_model_bytes: Sequence[int],
+    map_object_id: str,
+    modules: list[tuple[str, Sequence[int]]],
+) -> tuple[Any, ...]:
+    return (
+        map_model.decode_bytes(reader, model_bytes),
+        connector.decode_bytes(reader, connector_bytes),
+        build_process.decode_bytes(reader, build_process_bytes),
+        map_concrete_model.decode_bytes(reader, concrete_model_bytes, map_object_id),
+        [
+            map_concrete_model_module.decode_bytes(reader, module_bytes, module_type)
+            for module_type, module_bytes in modules
+        ],
+    )
+
+
 def encode(
     writer: FArchiveWriter, property_type: str, properties: dict[str, Any]
 ) -> int:
     if property_type != "ArrayProperty":
         raise Exception(f"Expected ArrayProperty, got {property_type}")
     del properties["custom_type"]
+    value = properties["value"]
+    encoded = {
+        **properties,
+        "value": {
+            **value,
+            "values": EncodedEntries(value["values"], encode_map_object),
+        },
+    }
+    return writer.property_inner(property_type, encoded)
 
-    for map_object in properties["value"]["values"]:
-        # Encode Model
-        if "values" not in map_object["Model"]["value"]["RawData"]["value"]:
-            map_object["Model"]["value"]["RawData"]["value"] = {
-                "values": map_model.encode_bytes(
-                    map_object["Model"]["value"]["RawData"]["value"]
-                )
-            }
-        # Encode Model.Connector
-        if (
-            "values"
-            not in map_object["Model"]["value"]["Connector"]["value"]["RawData"][
-                "value"
-            ]
-        ):
-            map_object["Model"]["value"]["Connector"]["value"]["RawData"]["value"] = {
-                "values": connector.encode_bytes(
-                    map_object["Model"]["value"]["Connector"]["value"]["RawData"][
-                        "value"
-                    ],
-                )
-            }
-        # Encode Model.BuildProcess
-        if (
-            "values"
-            not in map_object["Model"]["value"]["BuildProcess"]["value"]["RawData"][
-                "value"
-            ]
-        ):
-            map_object["Model"]["value"]["BuildProcess"]["value"]["RawData"][
-                "value"
-            ] = {
-                "values": build_process.encode_bytes(
-                    map_object["Model"]["value"]["BuildProcess"]["value"]["RawData"][
-                        "value"
-                    ],
-                )
-            }
-        # Encode ConcreteModel
-        if "values" not in map_object["ConcreteModel"]["value"]["RawData"]["value"]:
-            map_object["ConcreteModel"]["value"]["RawData"]["value"] = {
-                "values": map_concrete_model.encode_bytes(
-                    map_object["ConcreteModel"]["value"]["RawData"]["value"],
+
+def encode_map_object(map_object: dict[str, Any]) -> dict[str, Any]:
+    # Encode Model
+    if "values" not in map_object["Model"]["value"]["RawData"]["value"]:
+        map_object["Model"]["value"]["RawData"]["value"] = {
+            "values": map_model.encode_bytes(
+                map_object["Model"]["value"]["RawData"]["value"]
+            )
+        }
+    # Encode Model.Connector
+    if (
+        "values"
+        not in map_object["Model"]["value"]["Connector"]["value"]["RawData"]["value"]
+    ):
+        map_object["Model"]["value"]["Connector"]["value"]["RawData"]["value"] = {
+            "values": connector.encode_bytes(
+                map_object["Model"]["value"]["Connector"]["value"]["RawData"]["value"],
+            )
+        }
+    # Encode Model.BuildProcess
+    if (
+        "values"
+        not in map_object["Model"]["value"]["BuildProcess"]["value"]["RawData"]["value"]
+    ):
+        map_object["Model"]["value"]["BuildProcess"]["value"]["RawData"]["value"] = {
+            "values": build_process.encode_bytes(
+                map_object["Model"]["value"]["BuildProcess"]["value"]["RawData"][
+                    "value"
+                ],
+            )
+        }
+    # Encode ConcreteModel
+    if "values" not in map_object["ConcreteModel"]["value"]["RawData"]["value"]:
+        map_object["ConcreteModel"]["value"]["RawData"]["value"] = {
+            "values": map_concrete_model.encode_bytes(
+                map_object["ConcreteModel"]["value"]["RawData"]["value"],
+            )
+        }
+    # Encode ConcreteModel.ModuleMap
+    for module in map_object["ConcreteModel"]["value"]["ModuleMap"]["value"]:
+        if "values" not in module["value"]["RawData"]["value"]:
+            module_type = module["key"]
+            module["value"]["RawData"]["value"] = {
+                "values": map_concrete_model_module.encode_bytes(
+                    module["value"]["RawData"]["value"],
+                    module_type,
                 )
             }
-        # Encode ConcreteModel.ModuleMap
-        for module in map_object["ConcreteModel"]["value"]["ModuleMap"]["value"]:
-            if "values" not in module["value"]["RawData"]["value"]:
-                module_type = module["key"]
-                module["value"]["RawData"]["value"] = {
-                    "values": map_concrete_model_module.encode_bytes(
-                        module["value"]["RawData"]["value"],
-                        module_type,
-                    )
-                }
-
-    return writer.property_inner(property_type, properties)
+    return map_object
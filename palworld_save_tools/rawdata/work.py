@@ -1,6 +1,7 @@
 from typing import Any, Sequence
 
 from palworld_save_tools.archive import *
+from palworld_save_tools.rawdata.common import EncodedEntries, decode_entries
 
 WORK_BASE_TYPES = set(
     [
@@ -29,22 +30,47 @@ def decode(
     if type_name != "ArrayProperty":
         raise Exception(f"Expected ArrayProperty, got {type_name}")
     value = reader.property(type_name, size, path, nested_caller_path=path)
-    for work_element in value["value"]["values"]:
-        work_bytes = work_element["RawData"]["value"]["values"]
-        work_type = work_element["WorkableType"]["value"]["value"]
-        work_element["RawData"]["value"] = decode_bytes(reader, work_bytes, work_type)
-        for work_assign in work_element["WorkAssignMap"]["value"]:
-            work_assign_bytes = work_assign["value"]["RawData"]["value"]["values"]
-            work_assign["value"]["RawData"]["value"] = decode_work_assign_bytes(
-                reader, work_assign_bytes
+    work_elements = value["value"]["values"]
+    decoded = decode_entries(
+        reader,
+        decode_element_bytes,
+        [
+            (
+                work_element["RawData"]["value"]["values"],
+                work_element["WorkableType"]["value"]["value"],
+                [
+                    work_assign["value"]["RawData"]["value"]["values"]
+                    for work_assign in work_element["WorkAssignMap"]["value"]
+                ],
             )
+            for work_element in work_elements
+        ],
+    )
+    for work_element, (work_data, work_assigns_data) in zip(work_elements, decoded):
+        work_element["RawData"]["value"] = work_data
+        for work_assign, work_assign_data in zip(
+            work_element["WorkAssignMap"]["value"], work_assigns_data
+        ):
+            work_assign["value"]["RawData"]["value"] = work_assign_data
     return value
 
 
+def decode_element_bytes(
+    reader: FArchiveReader,
+    work_bytes: Sequence[int],
+    work_type: str,
+    work_assigns_bytes: list[Sequence[int]],
+) -> tuple[dict[str, Any], list[dict[str, Any]]]:
+    return (
+        decode_bytes(reader, work_bytes, work_type),
+        [decode_work_assign_bytes(reader, b) for b in work_assigns_bytes],
+    )
+
+
 def decode_bytes(
     parent_reader: FArchiveReader, b_bytes: Sequence[int], work_type: str
 ) -> dict[str, Any]:
-    reader = parent_reader.internal_copy(bytes(b_bytes), debug=False)
+    reader = parent_reader.sub_reader(b_bytes)
     data: dict[str, Any] = {}
     # Handle base serialization
     if work_type in WORK_BASE_TYPES:
@@ -132,7 +158,7 @@ def decode_bytes(
 def decode_work_assign_bytes(
     parent_reader: FArchiveReader, b_bytes: Sequence[int]
 ) -> dict[str, Any]:
-    reader = parent_reader.internal_copy(bytes(b_bytes), debug=False)
+    reader = parent_reader.sub_reader(b_bytes)
     data: dict[str, Any] = {}
 
     data["id"] = reader.guid()
@@ -157,23 +183,24 @@ def encode(
     if property_type != "ArrayProperty":
         raise Exception(f"Expected ArrayProperty, got {property_type}")
     del properties["custom_type"]
-    for work_element in properties["value"]["values"]:
-        work_type = work_element["WorkableType"]["value"]["value"]
-        work_element["RawData"]["value"] = {
-            "values": [
-                b for b in encode_bytes(work_element["RawData"]["value"], work_type)
-            ]
+    value = properties["value"]
+    encoded = {
+        **properties,
+        "value": {**value, "values": EncodedEntries(value["values"], encode_work)},
+    }
+    return writer.property_inner(property_type, encoded)
+
+
+def encode_work(work_element: dict[str, Any]) -> dict[str, Any]:
+    work_type = work_element["WorkableType"]["value"]["value"]
+    work_element["RawData"]["value"] = {
+        "values": encode_bytes(work_element["RawData"]["value"], work_type)
+    }
+    for work_assign in work_element["WorkAssignMap"]["value"]:
+        work_assign["value"]["RawData"]["value"] = {
+            "values": encode_work_assign_bytes(work_assign["value"]["RawData"]["value"])
         }
-        for work_assign in work_element["WorkAssignMap"]["value"]:
-            work_assign["value"]["RawData"]["value"] = {
-                "values": [
-                    b
-                    for b in encode_work_assign_bytes(
-                        work_assign["value"]["RawData"]["value"]
-                    )
-                ]
-            }
-    return writer.property_inner(property_type, properties)
+    return work_element
 
 
 def encode_bytes(p: dict[str, Any], work_type: str) -> bytes:
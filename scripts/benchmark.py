@@ -0,0 +1,311 @@
+#!/usr/bin/env python3
+# Micro-benchmarks for palworld-save-tools, run from the repository root:
+#   python scripts/benchmark.py compression [path to .sav file]
+#   python scripts/benchmark.py properties [path to .sav file]
+#   python scripts/benchmark.py floats
+#   python scripts/benchmark.py uuids [path to .sav file]
+#   python scripts/benchmark.py arrays
+#   python scripts/benchmark.py write [path to .sav file]
+
+import argparse
+import array
+import json
+import math
+import os
+import struct
+import sys
+import time
+import zlib
+from typing import Any, Callable
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from palworld_save_tools.archive import UUID, FArchiveReader, FArchiveWriter
+from palworld_save_tools.gvas import GvasFile
+from palworld_save_tools.json_tools import CustomEncoder
+from palworld_save_tools.palsav import (
+    FAST_SAVE_LEVELS,
+    compress_gvas_to_sav,
+    decompress_sav_to_gvas,
+)
+from palworld_save_tools.paltypes import PALWORLD_CUSTOM_PROPERTIES, PALWORLD_TYPE_HINTS
+
+DEFAULT_SAV = os.path.normpath(
+    os.path.join(os.path.dirname(__file__), "..", "tests", "testdata", "Level.sav")
+)
+
+
+def best_time(func: Callable[[], Any], repeat: int) -> tuple[float, Any]:
+    best = float("inf")
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def load_gvas(path: str) -> tuple[bytes, int]:
+    gvas_data, save_type = decompress_sav_to_gvas(path)
+    return bytes(gvas_data), save_type
+
+
+def compression(args: argparse.Namespace) -> None:
+    gvas_data, save_type = load_gvas(args.filename)
+    print(
+        f"{args.filename}: {len(gvas_data)} bytes of GVAS data, save type {save_type:#x}"
+    )
+    default = zlib.Z_DEFAULT_COMPRESSION
+    configs = [
+        ("default", default, default),
+        ("fast save", *FAST_SAVE_LEVELS),
+        ("1/1", 1, 1),
+        ("0/0", 0, 0),
+        ("6/0", 6, 0),
+        ("9/9", 9, 9),
+    ]
+    threads = sorted({1, args.threads})
+    print(f"{'inner/outer':<12} {'threads':>7} {'size':>10} {'ratio':>7} {'time':>10}")
+    baseline = None
+    for name, level, outer_level in configs:
+        for thread_count in threads:
+            elapsed, sav_data = best_time(
+                lambda: compress_gvas_to_sav(
+                    gvas_data,
+                    save_type,
+                    level=level,
+                    outer_level=outer_level,
+                    threads=thread_count,
+                ),
+                args.repeat,
+            )
+            if baseline is None:
+                baseline = elapsed
+            print(
+                f"{name:<12} {thread_count:>7} {len(sav_data):>10} "
+                f"{len(sav_data) / len(gvas_data):>7.3f} "
+                f"{elapsed * 1000:>8.1f}ms ({baseline / elapsed:.1f}x)"
+            )
+
+
+def count_properties(gvas_data: bytes) -> int:
+    count = 0
+    original = FArchiveReader.property
+
+    def counting_property(self, *args, **kwargs):
+        nonlocal count
+        count += 1
+        return original(self, *args, **kwargs)
+
+    FArchiveReader.property = counting_property  # type: ignore[method-assign]
+    try:
+        GvasFile.read(gvas_data, PALWORLD_TYPE_HINTS)
+    finally:
+        FArchiveReader.property = original  # type: ignore[method-assign]
+    return count
+
+
+def properties(args: argparse.Namespace) -> None:
+    gvas_data, _ = load_gvas(args.filename)
+    count = count_properties(gvas_data)
+    # By default without custom properties, so only the generic property
+    # decoding is timed
+    custom_properties = PALWORLD_CUSTOM_PROPERTIES if args.custom_properties else {}
+    elapsed, _ = best_time(
+        lambda: GvasFile.read(
+            gvas_data,
+            PALWORLD_TYPE_HINTS,
+            custom_properties,
+            allow_nan=not args.convert_nan_to_null,
+        ),
+        args.repeat,
+    )
+    print(f"{args.filename}: {count} properties")
+    print(f"read {elapsed * 1000:.1f}ms, {elapsed / count * 1e9:.0f}ns per property")
+
+
+def floats(args: argparse.Namespace) -> None:
+    count = 10000
+    # Mostly finite values with the odd NaN and infinity, like real saves
+    values = [float(i) for i in range(count * 10)]
+    values[::97] = [math.nan] * len(values[::97])
+    values[::89] = [math.inf] * len(values[::89])
+    float_data = struct.pack(f"<{len(values)}f", *values)
+    double_data = struct.pack(f"<{len(values)}d", *values)
+    cases: list[tuple[str, bytes, Callable[[FArchiveReader], Any], int]] = [
+        ("float", float_data, FArchiveReader.float, count * 10),
+        ("double", double_data, FArchiveReader.double, count * 10),
+        ("vector_dict", double_data, FArchiveReader.vector_dict, count),
+        ("ftransform", double_data, FArchiveReader.ftransform, count),
+    ]
+    print(f"{'reader':<12} {'allow_nan':>9} {'per call':>10}")
+    for name, data, read, calls in cases:
+        for allow_nan in (True, False):
+            reader = FArchiveReader(data, allow_nan=allow_nan)
+
+            def run():
+                reader.seek(0)
+                for _ in range(calls):
+                    read(reader)
+
+            elapsed, _ = best_time(run, args.repeat)
+            print(f"{name:<12} {allow_nan!s:>9} {elapsed / calls * 1e9:>8.0f}ns")
+
+
+def collect_uuids(value: Any, uuids: list[UUID]) -> None:
+    if isinstance(value, UUID):
+        uuids.append(value)
+    elif isinstance(value, dict):
+        for v in value.values():
+            collect_uuids(v, uuids)
+    elif isinstance(value, list):
+        for v in value:
+            collect_uuids(v, uuids)
+
+
+def uuids(args: argparse.Namespace) -> None:
+    gvas_data, _ = load_gvas(args.filename)
+    gvas_file = GvasFile.read(
+        gvas_data, PALWORLD_TYPE_HINTS, PALWORLD_CUSTOM_PROPERTIES
+    )
+    found: list[UUID] = []
+    collect_uuids(gvas_file.properties, found)
+    raw = [u.raw_bytes for u in found]
+    strings = [str(u) for u in found]
+    print(f"{args.filename}: {len(raw)} GUIDs, {len(set(raw))} distinct")
+
+    # Fresh UUIDs each run, as decoding a file produces them, so no cached
+    # string forms carry over between runs
+    def fresh() -> list[UUID]:
+        return [UUID(b) for b in raw]
+
+    def group_by() -> dict[UUID, list[int]]:
+        groups: dict[UUID, list[int]] = {}
+        for i, u in enumerate(fresh()):
+            groups.setdefault(u, []).append(i)
+        return groups
+
+    cases: list[tuple[str, Callable[[], Any]]] = [
+        ("create", fresh),
+        ("create + set", lambda: set(fresh())),
+        ("create + group by", group_by),
+        ("create + == str", lambda: sum(u == s for u, s in zip(fresh(), strings))),
+    ]
+    for name, func in cases:
+        elapsed, _ = best_time(func, args.repeat)
+        print(f"{name:<18} {elapsed * 1000:>8.1f}ms")
+
+
+def arrays(args: argparse.Namespace) -> None:
+    count = 1_000_000
+    cases: list[tuple[str, str, list[Any]]] = [
+        ("ByteProperty", "B", [i & 0xFF for i in range(count)]),
+        ("IntProperty", "i", list(range(-count // 2, count // 2))),
+        ("Int64Property", "q", list(range(count))),
+        ("FloatProperty", "f", [i / 8 for i in range(count)]),
+    ]
+    print(f"{'array type':<14} {'input':<11} {'write':>10}")
+    for array_type, typecode, values in cases:
+        inputs = [("list", values), ("array.array", array.array(typecode, values))]
+        for name, value in inputs:
+
+            def run():
+                writer = FArchiveWriter()
+                writer.array_property(array_type, {"values": value})
+                return writer.bytes()
+
+            elapsed, _ = best_time(run, args.repeat)
+            print(f"{array_type:<14} {name:<11} {elapsed * 1000:>8.1f}ms")
+
+
+def write(args: argparse.Namespace) -> None:
+    gvas_data, _ = load_gvas(args.filename)
+    custom_properties = PALWORLD_CUSTOM_PROPERTIES if args.custom_properties else {}
+    best = float("inf")
+    for _ in range(args.repeat):
+        # Custom encoders replace decoded raw data with bytes as they write,
+        # so every run writes a freshly read file
+        gvas_file = GvasFile.read(
+            gvas_data, PALWORLD_TYPE_HINTS, custom_properties, lazy=args.lazy
+        )
+        if args.lazy:
+            # Decode everything, as a job inspecting the save would, then
+            # make one small edit
+            json.dumps(gvas_file.dump(), cls=CustomEncoder)
+            world = gvas_file.properties["worldSaveData"]["value"]
+            world["GameTimeSaveData"]["value"]["RealDateTimeTicks"]["value"] += 1
+        start = time.perf_counter()
+        written = gvas_file.write(custom_properties)
+        best = min(best, time.perf_counter() - start)
+    if not args.lazy:
+        assert written == gvas_data, "written file does not match the original"
+    print(f"{args.filename}: {len(gvas_data)} bytes")
+    print(f"write {best * 1000:.1f}ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmarks for palworld-save-tools")
+    parser.add_argument(
+        "--repeat", type=int, default=5, help="Runs per case, the best is reported"
+    )
+    subparsers = parser.add_subparsers(dest="benchmark", required=True)
+
+    compression_parser = subparsers.add_parser(
+        "compression", help="Size/time tradeoff of SAV compression settings"
+    )
+    compression_parser.add_argument("filename", nargs="?", default=DEFAULT_SAV)
+    compression_parser.add_argument("--threads", type=int, default=os.cpu_count() or 1)
+    compression_parser.set_defaults(func=compression)
+
+    properties_parser = subparsers.add_parser(
+        "properties", help="Per-property overhead of GvasFile.read"
+    )
+    properties_parser.add_argument("filename", nargs="?", default=DEFAULT_SAV)
+    properties_parser.add_argument(
+        "--custom-properties",
+        action="store_true",
+        help="Also decode raw data with the Palworld custom properties",
+    )
+    properties_parser.add_argument(
+        "--convert-nan-to-null",
+        action="store_true",
+        help="Read with allow_nan=False, as convert --convert-nan-to-null does",
+    )
+    properties_parser.set_defaults(func=properties)
+
+    floats_parser = subparsers.add_parser(
+        "floats", help="Cost of float decoding with and without allow_nan"
+    )
+    floats_parser.set_defaults(func=floats)
+
+    uuids_parser = subparsers.add_parser(
+        "uuids", help="Hashing and comparing the GUIDs of a save"
+    )
+    uuids_parser.add_argument("filename", nargs="?", default=DEFAULT_SAV)
+    uuids_parser.set_defaults(func=uuids)
+
+    arrays_parser = subparsers.add_parser(
+        "arrays", help="Writing large numeric ArrayProperty values"
+    )
+    arrays_parser.set_defaults(func=arrays)
+
+    write_parser = subparsers.add_parser("write", help="Time of GvasFile.write")
+    write_parser.add_argument("filename", nargs="?", default=DEFAULT_SAV)
+    write_parser.add_argument(
+        "--custom-properties",
+        action="store_true",
+        help="Also encode raw data with the Palworld custom properties",
+    )
+    write_parser.add_argument(
+        "--lazy",
+        action="store_true",
+        help="Read lazily, decode everything and edit a single value first",
+    )
+    write_parser.set_defaults(func=write)
+
+    args = parser.parse_args()
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,9 +1,30 @@
+import array
+import io
+import json
+import math
+import struct
 import unittest
 import uuid
+from unittest import mock
 
 from parameterized import parameterized
 
-from palworld_save_tools.archive import UUID, FArchiveReader, FArchiveWriter
+from palworld_save_tools.archive import (
+    UUID,
+    FArchiveReader,
+    FArchiveWriter,
+    IntProp,
+    PathFilter,
+    PathTrie,
+    PropertyNode,
+    UUIDRegistry,
+    instance_id_reader,
+    instance_id_writer,
+    to_dicts,
+    uuid_reader,
+    uuid_writer,
+)
+from palworld_save_tools.json_tools import CustomEncoder, dump_stream
 
 
 class TestArchive(unittest.TestCase):
@@ -36,6 +57,422 @@ class TestArchive(unittest.TestCase):
         self.assertEqual(y, y_e)
         self.assertEqual(z, z_e)
 
+    def test_reader_accepts_buffer_types(self):
+        test_uuid = "c1b41f12-90d3-491f-be71-b34e8e0deb5a"
+        writer = FArchiveWriter()
+        writer.fstring("test")
+        writer.fstring("テスト")
+        writer.i32(-5)
+        writer.guid(UUID.from_str(test_uuid))
+        data = writer.bytes()
+        for buf in (data, bytearray(data), memoryview(data)):
+            reader = FArchiveReader(buf)
+            self.assertEqual("test", reader.fstring())
+            self.assertEqual("テスト", reader.fstring())
+            pos = reader.tell()
+            self.assertEqual(-5, reader.i32())
+            reader.seek(pos)
+            self.assertEqual(-5, reader.i32())
+            self.assertEqual(test_uuid, str(reader.guid()))
+            self.assertTrue(reader.eof())
+
+    def test_fstring_cache(self):
+        writer = FArchiveWriter()
+        for _ in range(2):
+            writer.fstring("EPalWorkableType::Progress")
+            writer.fstring("テスト")
+        writer.fstring("x" * 1000)
+        data = writer.bytes()
+        for buf in (data, bytearray(data)):
+            reader = FArchiveReader(buf)
+            first = reader.fstring()
+            self.assertEqual("テスト", reader.fstring())
+            second = reader.fstring()
+            self.assertEqual("テスト", reader.fstring())
+            self.assertEqual("EPalWorkableType::Progress", first)
+            # Repeated names share one object
+            self.assertIs(first, second)
+            self.assertEqual("x" * 1000, reader.fstring())
+            self.assertTrue(reader.eof())
+            # Each reader has its own cache, shared with its sub readers
+            self.assertEqual({b"EPalWorkableType::Progress"}, set(reader.fstrings))
+            self.assertIs(reader.fstrings, reader.sub_reader(b"").fstrings)
+            self.assertEqual({}, FArchiveReader(buf).fstrings)
+
+    @parameterized.expand(
+        [
+            ("", b"\x00\x00\x00\x00"),
+            ("None", b"\x05\x00\x00\x00None\x00"),
+            ("テ", b"\xfe\xff\xff\xff\xc6\x30\x00\x00"),
+        ]
+    )
+    def test_fstring_write(self, string, expected):
+        writer = FArchiveWriter()
+        # The second write comes from the encoded string cache
+        self.assertEqual(len(expected), writer.fstring(string))
+        self.assertEqual(len(expected), writer.fstring(string))
+        self.assertEqual(expected * 2, writer.bytes())
+
+    def test_bulk_guids(self):
+        guids = [UUID(bytes([i] * 16)) for i in range(6)]
+        instance_ids = [
+            {"guid": a, "instance_id": b} for a, b in zip(guids[::2], guids[1::2])
+        ]
+        writer = FArchiveWriter()
+        writer.tarray(uuid_writer, guids)
+        writer.tarray(instance_id_writer, instance_ids)
+        data = writer.bytes()
+        reader = FArchiveReader(data)
+        self.assertEqual(guids, reader.guids(reader.u32()))
+        self.assertEqual(instance_ids, reader.instance_ids(reader.u32()))
+        self.assertTrue(reader.eof())
+        # Same values as the per element readers
+        reader = FArchiveReader(data)
+        self.assertEqual(guids, reader.tarray(uuid_reader))
+        self.assertEqual(instance_ids, reader.tarray(instance_id_reader))
+        with self.assertRaises(Exception):
+            FArchiveReader(bytes(40)).guids(3)
+
+    def test_uuid_registry(self):
+        test_uuid = UUID.from_str("c1b41f12-90d3-491f-be71-b34e8e0deb5a")
+        writer = FArchiveWriter()
+        writer.guid(test_uuid)
+        writer.optional_guid(test_uuid)
+        writer.tarray(uuid_writer, [test_uuid, test_uuid])
+        reader = FArchiveReader(writer.bytes())
+        first = reader.guid()
+        self.assertEqual(test_uuid, first)
+        # Every occurrence of a GUID shares one instance
+        self.assertIs(first, reader.optional_guid())
+        self.assertEqual([first, first], reader.guids(reader.u32()))
+        self.assertIs(first, reader.internal_copy(writer.bytes(), False).guid())
+        self.assertIsInstance(reader.uuids, UUIDRegistry)
+        self.assertEqual(1, len(reader.uuids))
+        # The shared instance is only formatted once
+        self.assertIs(str(first), str(reader.uuids[first.raw_bytes]))
+
+    def test_sub_reader(self):
+        test_uuid = UUID.from_str("c1b41f12-90d3-491f-be71-b34e8e0deb5a")
+        writer = FArchiveWriter()
+        writer.u32(7)
+        writer.guid(test_uuid)
+        writer.fstring("blob")
+        writer.u32(9)
+        data = writer.bytes()
+        reader = FArchiveReader(data, type_hints={"a": "b"}, allow_nan=False)
+        self.assertEqual(7, reader.u32())
+        blob = reader.slice(len(data) - 8)
+        sub_reader = reader.sub_reader(blob)
+        self.assertEqual(9, reader.u32())
+        self.assertTrue(reader.eof())
+        # The sub reader reads the window from its start without copying
+        self.assertIs(blob, sub_reader.data)
+        self.assertEqual(test_uuid, sub_reader.guid())
+        self.assertEqual("blob", sub_reader.fstring())
+        self.assertTrue(sub_reader.eof())
+        self.assertIs(reader.type_hints, sub_reader.type_hints)
+        self.assertFalse(sub_reader.allow_nan)
+        self.assertIs(reader.uuids, sub_reader.uuids)
+        self.assertEqual(7, reader.sub_reader([7, 0, 0, 0]).u32())
+
+    def test_byte_array_property(self):
+        test_uuid = UUID.from_str("c1b41f12-90d3-491f-be71-b34e8e0deb5a")
+        expected = FArchiveWriter()
+        size = expected.property_inner(
+            "ArrayProperty",
+            {
+                "array_type": "ByteProperty",
+                "id": test_uuid,
+                "value": {"values": b"\x01\x02\x03"},
+            },
+        )
+        writer = FArchiveWriter()
+        property = {"array_type": "ByteProperty", "id": test_uuid, "value": [1, 2, 3]}
+        self.assertEqual(
+            size,
+            writer.byte_array_property(property, lambda w, v: w.write(bytes(v))),
+        )
+        self.assertEqual(expected.bytes(), writer.bytes())
+        self.assertEqual([1, 2, 3], property["value"])
+
+    def test_byte_array_roundtrip(self):
+        blob = bytes(range(256))
+        writer = FArchiveWriter()
+        writer.properties(
+            {
+                "RawData": {
+                    "array_type": "ByteProperty",
+                    "id": None,
+                    "value": {"values": blob},
+                    "type": "ArrayProperty",
+                }
+            }
+        )
+        data = writer.bytes()
+        properties = FArchiveReader(data).properties_until_end()
+        values = properties["RawData"]["value"]["values"]
+        self.assertIsInstance(values, bytes)
+        self.assertEqual(blob, values)
+        # JSON stores the blob as base64, and legacy int lists are still accepted
+        js = json.loads(json.dumps(properties, cls=CustomEncoder))
+        self.assertIsInstance(js["RawData"]["value"]["values"], str)
+        for encoded in (js["RawData"]["value"]["values"], list(blob)):
+            properties["RawData"]["value"]["values"] = encoded
+            writer = FArchiveWriter()
+            writer.properties(properties)
+            self.assertEqual(data, writer.bytes())
+        # The old int list encoding is still available
+        properties["RawData"]["value"]["values"] = blob
+        js = json.loads(json.dumps(properties, cls=CustomEncoder, byte_lists=True))
+        self.assertEqual(list(blob), js["RawData"]["value"]["values"])
+        stream = io.StringIO()
+        dump_stream(properties, stream, byte_lists=True)
+        self.assertEqual(js, json.loads(stream.getvalue()))
+
+    def test_property_roundtrip(self):
+        test_uuid = UUID.from_str("c1b41f12-90d3-491f-be71-b34e8e0deb5a")
+        properties = {
+            "Int": {"id": None, "value": -5, "type": "IntProperty"},
+            "IntWithId": {"id": test_uuid, "value": 7, "type": "IntProperty"},
+            "UInt16": {"id": None, "value": 65535, "type": "UInt16Property"},
+            "UInt32": {"id": test_uuid, "value": 2**32 - 1, "type": "UInt32Property"},
+            "Int64": {"id": None, "value": -(2**40), "type": "Int64Property"},
+            "Float": {"id": test_uuid, "value": 0.5, "type": "FloatProperty"},
+            "Str": {"id": None, "value": "テスト", "type": "StrProperty"},
+            "Name": {"id": test_uuid, "value": "Name", "type": "NameProperty"},
+            "Bool": {"value": True, "id": None, "type": "BoolProperty"},
+            "Enum": {
+                "id": None,
+                "value": {"type": "EType", "value": "EType::A"},
+                "type": "EnumProperty",
+            },
+            "Byte": {
+                "id": None,
+                "value": {"type": "None", "value": 3},
+                "type": "ByteProperty",
+            },
+            "Color": {
+                "struct_type": "LinearColor",
+                "struct_id": UUID(bytes(16)),
+                "id": None,
+                "value": {"r": 0.25, "g": 0.5, "b": 0.75, "a": 1.0},
+                "type": "StructProperty",
+            },
+        }
+        writer = FArchiveWriter()
+        writer.properties(properties)
+        data = writer.bytes()
+        decoded = FArchiveReader(data).properties_until_end()
+        self.assertEqual(properties, decoded)
+        # Key order is preserved, as it determines the JSON output
+        for name in properties:
+            self.assertEqual(list(properties[name]), list(decoded[name]))
+
+    def test_compact_property_roundtrip(self):
+        test_uuid = UUID.from_str("c1b41f12-90d3-491f-be71-b34e8e0deb5a")
+        properties = {
+            "Int": {"id": test_uuid, "value": 7, "type": "IntProperty"},
+            "Bool": {"value": True, "id": None, "type": "BoolProperty"},
+            "Names": {
+                "array_type": "NameProperty",
+                "id": None,
+                "value": {"values": ["A", "B"]},
+                "type": "ArrayProperty",
+            },
+            "Struct": {
+                "struct_type": "Thing",
+                "struct_id": test_uuid,
+                "id": None,
+                "value": {
+                    "Float": {"id": None, "value": 1.5, "type": "FloatProperty"},
+                    "Str": {"id": None, "value": "s", "type": "StrProperty"},
+                },
+                "type": "StructProperty",
+            },
+            "Enum": {
+                "id": None,
+                "value": {"type": "EThing", "value": "EThing::A"},
+                "type": "EnumProperty",
+            },
+            "Byte": {
+                "id": None,
+                "value": {"type": "None", "value": 3},
+                "type": "ByteProperty",
+            },
+            "Map": {
+                "key_type": "NameProperty",
+                "value_type": "IntProperty",
+                "key_struct_type": None,
+                "value_struct_type": None,
+                "id": None,
+                "value": [{"key": "k", "value": 1}],
+                "type": "MapProperty",
+            },
+        }
+        writer = FArchiveWriter()
+        writer.properties(properties)
+        data = writer.bytes()
+        # Nodes are built directly, without decoding into dicts first
+        with mock.patch.object(FArchiveReader, "struct", side_effect=AssertionError):
+            decoded = FArchiveReader(data, compact=True).properties_until_end()
+        self.assertIsInstance(decoded["Int"], IntProp)
+        self.assertIsInstance(decoded["Struct"]["value"]["Float"], PropertyNode)
+        self.assertEqual(properties, decoded)
+        for name in properties:
+            self.assertEqual(list(properties[name]), list(decoded[name]))
+        self.assertEqual(properties, to_dicts(decoded))
+        self.assertIs(type(to_dicts(decoded)["Bool"]), dict)
+        decoded["Int"]["value"] = 8
+        self.assertEqual(decoded["Int"].value, 8)
+        with self.assertRaises(KeyError):
+            decoded["Int"]["custom_type"] = "test"
+        writer = FArchiveWriter()
+        writer.properties(decoded)
+        properties["Int"]["value"] = 8
+        expected = FArchiveWriter()
+        expected.properties(properties)
+        self.assertEqual(expected.bytes(), writer.bytes())
+
+    def test_non_finite_to_none(self):
+        values = [1.5, math.nan, math.inf, -math.inf]
+        writer = FArchiveWriter()
+        for value in values:
+            writer.float(value)
+            writer.double(value)
+        writer.vector(math.nan, 2.0, -math.inf)
+        reader = FArchiveReader(writer.bytes(), allow_nan=False)
+        for expected in (1.5, None, None, None):
+            self.assertEqual(expected, reader.float())
+            self.assertEqual(expected, reader.double())
+        self.assertEqual((None, 2.0, None), reader.vector())
+        self.assertTrue(reader.eof())
+
+    @parameterized.expand([(True,), (False,)])
+    def test_geometry_roundtrip(self, allow_nan):
+        transform = {
+            "rotation": {"x": 0.0, "y": 0.5, "z": -0.5, "w": 1.0},
+            "translation": {"x": 1.0, "y": -2.0, "z": float("inf")},
+            "scale3d": {"x": 1.0, "y": 1.0, "z": 1.0},
+        }
+        writer = FArchiveWriter()
+        writer.ftransform(transform)
+        writer.vector_dict(transform["translation"])
+        writer.quat_dict(transform["rotation"])
+        reader = FArchiveReader(writer.bytes(), allow_nan=allow_nan)
+        if not allow_nan:
+            transform["translation"]["z"] = None
+        self.assertEqual(transform, reader.ftransform())
+        self.assertEqual(transform["translation"], reader.vector_dict())
+        self.assertEqual(transform["rotation"], reader.quat_dict())
+        self.assertTrue(reader.eof())
+
+    @parameterized.expand(
+        [
+            ("ByteProperty", "B", [0, 1, 255]),
+            ("IntProperty", "i", [0, -1, 2**31 - 1]),
+            ("UInt32Property", "I", [0, 1, 2**32 - 1]),
+            ("Int64Property", "q", [0, -1, 2**63 - 1]),
+            ("FloatProperty", "f", [0.0, -1.5, 2.0]),
+        ]
+    )
+    def test_packed_array_write(self, array_type, item_format, values):
+        expected = struct.pack(f"<I{len(values)}{item_format}", len(values), *values)
+        for typecode in "f" if item_format == "f" else "bBilqI":
+            try:
+                typed = array.array(typecode, values)
+            except (OverflowError, TypeError):
+                continue
+            writer = FArchiveWriter()
+            writer.array_property(array_type, {"values": typed})
+            self.assertEqual(expected, writer.bytes(), typecode)
+        writer = FArchiveWriter()
+        writer.array_property(array_type, {"values": values})
+        self.assertEqual(expected, writer.bytes())
+
+    def test_array_write(self):
+        writer = FArchiveWriter()
+        writer.array_property("FloatProperty", {"values": [1.0, None]})
+        self.assertEqual(struct.pack("<I2f", 2, 1.0, math.nan), writer.bytes())
+        guids = [UUID(bytes([i] * 16)) for i in range(3)]
+        writer = FArchiveWriter()
+        writer.array_property("Guid", {"values": guids})
+        writer.array_property("NameProperty", {"values": ["a", "b"]})
+        reader = FArchiveReader(writer.bytes())
+        self.assertEqual(guids, reader.guids(reader.u32()))
+        self.assertEqual(["a", "b"], reader.tarray(lambda r: r.fstring()))
+        with self.assertRaises(Exception):
+            FArchiveWriter().array_property("SoftObjectProperty", {"values": [1]})
+
+    @parameterized.expand([("Vector",), ("Quat",), ("LinearColor",)])
+    def test_packed_struct_array_roundtrip(self, struct_type):
+        keys = FArchiveReader._packed_structs[struct_type][1]
+        properties = {
+            "Values": {
+                "array_type": "StructProperty",
+                "id": None,
+                "value": {
+                    "prop_name": "Values",
+                    "prop_type": "StructProperty",
+                    "values": [
+                        {key: float(i + j) for j, key in enumerate(keys)}
+                        for i in range(5)
+                    ],
+                    "type_name": struct_type,
+                    "id": UUID(bytes(16)),
+                },
+                "type": "ArrayProperty",
+            }
+        }
+        writer = FArchiveWriter()
+        writer.properties(properties)
+        reader = FArchiveReader(writer.bytes())
+        self.assertEqual(properties, reader.properties_until_end())
+        self.assertTrue(reader.eof())
+
+    def test_unknown_property_type(self):
+        writer = FArchiveWriter()
+        writer.fstring("Test")
+        writer.fstring("SoftObjectProperty")
+        writer.u64(0)
+        with self.assertRaisesRegex(Exception, "Unknown type: SoftObjectProperty"):
+            FArchiveReader(writer.bytes()).properties_until_end()
+
+    @parameterized.expand(
+        [
+            (".worldSaveData", ["worldSaveData.GroupSaveDataMap"], None, True),
+            (".worldSaveData.GroupSaveDataMap", ["worldSaveData.Group*"], None, True),
+            (
+                ".worldSaveData.GroupSaveDataMap.Key",
+                ["worldSaveData.Group*"],
+                None,
+                True,
+            ),
+            (".worldSaveData.MapObjectSaveData", ["worldSaveData.Group*"], None, False),
+            (".Timestamp", ["worldSaveData.Group*"], None, False),
+            (".worldSaveData.GroupSaveDataMap", ["*"], None, True),
+            (".worldSaveData.MapObjectSaveData", None, ["*.MapObject*"], False),
+            (".worldSaveData.MapObjectSaveData.Key", None, ["*.MapObject*"], True),
+            (".MapObjectSaveData", None, ["*.MapObject*"], True),
+            (".worldSaveData.GroupSaveDataMap", ["worldSaveData"], ["*.Group*"], False),
+        ]
+    )
+    def test_path_filter(self, path, include, exclude, expected):
+        path_filter = PathFilter(include, exclude)
+        self.assertEqual(path_filter(path), expected)
+        # cached result
+        self.assertEqual(path_filter(path), expected)
+
+    def test_path_trie(self):
+        paths = PathTrie()
+        path = paths[""]["worldSaveData"]
+        self.assertEqual(path, ".worldSaveData")
+        key_path = paths[path]["Key"]
+        self.assertEqual(key_path, ".worldSaveData.Key")
+        # Paths are built once and reused
+        self.assertIs(paths[path]["Key"], key_path)
+        self.assertIs(paths[".worldSaveData"]["Key"], key_path)
+        self.assertIs(paths[".worldSaveData"], paths[path])
+
     def test_uuid_wrapper_matches_stdlib(self):
         test_uuid = "c1b41f12-90d3-491f-be71-b34e8e0deb5a"
         expected = uuid.UUID(test_uuid)
@@ -93,3 +530,26 @@ class TestArchive(unittest.TestCase):
         wrapper = UUID.from_str(test_uuid)
         wrapper2 = UUID.from_str(test_uuid)
         self.assertEqual(hash(wrapper), hash(wrapper2))
+
+    def test_uuid_wrapper_str_interop(self):
+        test_uuid = "c1b41f12-90d3-491f-be71-b34e8e0deb5a"
+        wrapper = UUID.from_str(test_uuid)
+        self.assertIn(test_uuid, {wrapper})
+        self.assertIn(wrapper, {test_uuid})
+        self.assertEqual(1, {test_uuid: 1}.get(wrapper))
+        self.assertEqual(1, {wrapper: 1}.get(test_uuid))
+        self.assertEqual(1, len({wrapper, test_uuid}))
+
+    def test_uuid_wrapper_compares_with_other_forms(self):
+        test_uuid = "c1b41f12-90d3-491f-be71-b34e8e0deb5a"
+        wrapper = UUID.from_str(test_uuid)
+        self.assertEqual(hash(test_uuid), hash(wrapper))
+        self.assertEqual(wrapper, test_uuid)
+        self.assertEqual(wrapper, uuid.UUID(test_uuid))
+        # Only the form str() gives compares equal, matching the hash
+        self.assertNotEqual(wrapper, test_uuid.upper())
+        self.assertNotEqual(wrapper, "c1b41f12-90d3-491f-be71-b34e8e0deb5b")
+        self.assertNotEqual(wrapper, "not a guid")
+        self.assertNotEqual(wrapper, None)
+        self.assertFalse(wrapper != test_uuid)
+        self.assertEqual(1, len({wrapper, UUID(bytes(wrapper.raw_bytes))}))
@@ -5,6 +5,8 @@ import unittest
 
 from parameterized import parameterized
 
+from palworld_save_tools.palsav import compress_gvas_to_sav, decompress_sav_to_gvas
+
 
 class TestCliScripts(unittest.TestCase):
     @parameterized.expand(
@@ -115,3 +117,90 @@ class TestCliScripts(unittest.TestCase):
                 os.remove(f"tests/testdata/{dir_name}/3-{base_name}")
             with contextlib.suppress(FileNotFoundError):
                 os.remove(f"tests/testdata/{dir_name}/3-{base_name}.json")
+
+    def test_filtered_json_cannot_be_converted(self):
+        json_path = "tests/testdata/filtered-Level.sav.json"
+        sav_path = "tests/testdata/filtered-Level.sav"
+        try:
+            run = subprocess.run(
+                [
+                    "python3",
+                    "-m",
+                    "palworld_save_tools.commands.convert",
+                    "tests/testdata/Level.sav",
+                    "--include",
+                    "worldSaveData.GameTime*",
+                    "--output",
+                    json_path,
+                ]
+            )
+            self.assertEqual(run.returncode, 0)
+            run = subprocess.run(
+                [
+                    "python3",
+                    "-m",
+                    "palworld_save_tools.commands.convert",
+                    json_path,
+                    "--output",
+                    sav_path,
+                ]
+            )
+            self.assertNotEqual(run.returncode, 0)
+            self.assertFalse(os.path.exists(sav_path))
+        finally:
+            with contextlib.suppress(FileNotFoundError):
+                os.remove(json_path)
+            with contextlib.suppress(FileNotFoundError):
+                os.remove(sav_path)
+
+    @parameterized.expand(
+        [
+            ([], (1, 0)),
+            (["--compression-level", "9"], (9, 0)),
+            (["--outer-compression-level", "6"], (1, 6)),
+        ]
+    )
+    def test_fast_save_levels(self, level_args, levels):
+        json_path = "tests/testdata/fast-Level.sav.json"
+        sav_path = "tests/testdata/fast-Level.sav"
+        try:
+            run = subprocess.run(
+                [
+                    "python3",
+                    "-m",
+                    "palworld_save_tools.commands.convert",
+                    "tests/testdata/Level.sav",
+                    "--output",
+                    json_path,
+                ]
+            )
+            self.assertEqual(run.returncode, 0)
+            run = subprocess.run(
+                [
+                    "python3",
+                    "-m",
+                    "palworld_save_tools.commands.convert",
+                    json_path,
+                    "--output",
+                    sav_path,
+                    "--fast-save",
+                    *level_args,
+                ]
+            )
+            self.assertEqual(run.returncode, 0)
+            with open(sav_path, "rb") as f:
+                sav_data = f.read()
+            # Explicit levels take precedence over the fast save ones
+            gvas_data, save_type = decompress_sav_to_gvas(sav_data)
+            level, outer_level = levels
+            self.assertEqual(
+                compress_gvas_to_sav(
+                    gvas_data, save_type, level=level, outer_level=outer_level
+                ),
+                sav_data,
+            )
+        finally:
+            with contextlib.suppress(FileNotFoundError):
+                os.remove(json_path)
+            with contextlib.suppress(FileNotFoundError):
+                os.remove(sav_path)
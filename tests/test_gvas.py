@@ -1,14 +1,31 @@
 import base64
+import io
 import json
 import unittest
+from unittest import mock
 
 from parameterized import parameterized
 
-from palworld_save_tools.archive import UUID, FArchiveReader, FArchiveWriter
+from palworld_save_tools import json_tools
+from palworld_save_tools.archive import (
+    UUID,
+    FArchiveReader,
+    FArchiveWriter,
+    LazyProperty,
+    PathFilter,
+    PropertyNode,
+    StructProp,
+)
 from palworld_save_tools.gvas import GvasFile, GvasHeader
-from palworld_save_tools.json_tools import CustomEncoder
+from palworld_save_tools.json_tools import (
+    CustomEncoder,
+    LazyJSONArray,
+    dump_stream,
+    load_stream,
+)
 from palworld_save_tools.palsav import decompress_sav_to_gvas
 from palworld_save_tools.paltypes import PALWORLD_CUSTOM_PROPERTIES, PALWORLD_TYPE_HINTS
+from palworld_save_tools.rawdata import common as rawdata_common
 
 
 class TestGvas(unittest.TestCase):
@@ -160,3 +177,336 @@ class TestGvas(unittest.TestCase):
             new_gvas_data,
             "sav does not match expected after roundtrip",
         )
+
+    @parameterized.expand(
+        [
+            ("Level.sav", "\t"),
+            ("Level.sav", None),
+            ("Level-tricky-unicode-player-name.sav", "\t"),
+            ("LevelMeta.sav", "\t"),
+            ("LocalData.sav", None),
+            ("WorldOption.sav", "\t"),
+            ("00000000000000000000000000000001.sav", "\t"),
+            ("unicode-saves/Level.sav", None),
+        ]
+    )
+    def test_stream_matches_dump(self, file_name, indent):
+        with open("tests/testdata/" + file_name, "rb") as f:
+            data = f.read()
+        gvas_data, _ = decompress_sav_to_gvas(data)
+        gvas_file = GvasFile.read(
+            gvas_data, PALWORLD_TYPE_HINTS, PALWORLD_CUSTOM_PROPERTIES
+        )
+        expected = json.dumps(gvas_file.dump(), indent=indent, cls=CustomEncoder)
+        out = io.StringIO()
+        dump_stream(
+            GvasFile.stream(gvas_data, PALWORLD_TYPE_HINTS, PALWORLD_CUSTOM_PROPERTIES),
+            out,
+            indent=indent,
+            buffer_chunks=16,
+        )
+        self.assertEqual(
+            out.getvalue(), expected, "streamed JSON does not match json.dumps"
+        )
+
+    @parameterized.expand(
+        [
+            ("Level.sav", 1024),
+            ("Level.sav", 1024 * 1024),
+            ("Level-tricky-unicode-player-name.sav", 1024),
+            ("LevelMeta.sav", 1024),
+            ("LocalData.sav", 1024),
+            ("WorldOption.sav", 1024),
+            ("00000000000000000000000000000001.sav", 1024),
+            ("unicode-saves/Level.sav", 1024),
+        ]
+    )
+    def test_load_stream_roundtrip(self, file_name, lazy_threshold):
+        with open("tests/testdata/" + file_name, "rb") as f:
+            data = f.read()
+        gvas_data, _ = decompress_sav_to_gvas(data)
+        gvas_file = GvasFile.read(
+            gvas_data, PALWORLD_TYPE_HINTS, PALWORLD_CUSTOM_PROPERTIES
+        )
+        js = json.dumps(
+            gvas_file.dump(), indent="\t", cls=CustomEncoder, ensure_ascii=False
+        )
+        lazy_js = load_stream(io.BytesIO(js.encode("utf-8")), lazy_threshold)
+        new_gvas_data = GvasFile.load(lazy_js).write(PALWORLD_CUSTOM_PROPERTIES)
+        self.assertEqual(
+            gvas_data,
+            new_gvas_data,
+            "sav does not match expected after lazy JSON roundtrip",
+        )
+
+    def test_load_stream_keeps_offsets(self):
+        doc = {"a": [{"x": i, "pad": "p" * 50} for i in range(50)], "b": 1}
+        lazy_js = load_stream(io.BytesIO(json.dumps(doc).encode("utf-8")), 256)
+        values = lazy_js["a"]
+        self.assertIs(values, lazy_js["a"])
+        with mock.patch.object(
+            json_tools, "_scan_container", wraps=json_tools._scan_container
+        ) as scan:
+            self.assertEqual(50, len(values))
+            self.assertEqual(50, len(values))
+            self.assertEqual(doc["a"], list(values))
+            self.assertEqual(doc["a"][-3], values[-3])
+            with self.assertRaises(IndexError):
+                values[50]
+        # The array is scanned once, by the first len()
+        self.assertEqual(1, scan.call_count)
+        self.assertEqual(1, lazy_js["b"])
+
+    def test_load_stream_custom_property_entries(self):
+        with open("tests/testdata/Level.sav", "rb") as f:
+            data = f.read()
+        gvas_data, _ = decompress_sav_to_gvas(data)
+        gvas_file = GvasFile.read(
+            gvas_data, PALWORLD_TYPE_HINTS, PALWORLD_CUSTOM_PROPERTIES
+        )
+        js = json.dumps(gvas_file.dump(), cls=CustomEncoder)
+        lazy_js = load_stream(io.BytesIO(js.encode("utf-8")), 1024)
+        world = lazy_js["properties"]["worldSaveData"]["value"]
+        map_objects = world["MapObjectSaveData"]
+        self.assertIsInstance(map_objects, dict)
+        # Only the entries are parsed in full, not the whole custom property
+        self.assertIsInstance(map_objects["value"]["values"], LazyJSONArray)
+        for map_object in map_objects["value"]["values"]:
+            self.assertIsInstance(map_object, dict)
+        new_gvas_data = GvasFile.load(lazy_js).write(PALWORLD_CUSTOM_PROPERTIES)
+        self.assertEqual(gvas_data, new_gvas_data)
+
+    @parameterized.expand(
+        [
+            ("Level.sav",),
+            ("Level-tricky-unicode-player-name.sav",),
+            ("LevelMeta.sav",),
+            ("LocalData.sav",),
+            ("WorldOption.sav",),
+            ("00000000000000000000000000000001.sav",),
+        ]
+    )
+    def test_lazy_read(self, file_name):
+        with open("tests/testdata/" + file_name, "rb") as f:
+            data = f.read()
+        gvas_data, _ = decompress_sav_to_gvas(data)
+        lazy_file = GvasFile.read(
+            gvas_data, PALWORLD_TYPE_HINTS, PALWORLD_CUSTOM_PROPERTIES, lazy=True
+        )
+        self.assertEqual(
+            gvas_data,
+            lazy_file.write(PALWORLD_CUSTOM_PROPERTIES),
+            "untouched lazy sav does not match original",
+        )
+        gvas_file = GvasFile.read(
+            gvas_data, PALWORLD_TYPE_HINTS, PALWORLD_CUSTOM_PROPERTIES
+        )
+        self.assertEqual(
+            json.dumps(lazy_file.dump(), cls=CustomEncoder),
+            json.dumps(gvas_file.dump(), cls=CustomEncoder),
+            "lazy sav does not decode to the same JSON",
+        )
+        self.assertEqual(
+            gvas_data,
+            lazy_file.write(PALWORLD_CUSTOM_PROPERTIES),
+            "decoded lazy sav does not match original",
+        )
+
+    def test_lazy_read_partial_edit(self):
+        with open("tests/testdata/Level.sav", "rb") as f:
+            data = f.read()
+        gvas_data, _ = decompress_sav_to_gvas(data)
+        gvas_files = [
+            GvasFile.read(
+                gvas_data, PALWORLD_TYPE_HINTS, PALWORLD_CUSTOM_PROPERTIES, lazy=lazy
+            )
+            for lazy in (False, True)
+        ]
+        for gvas_file in gvas_files:
+            world = gvas_file.properties["worldSaveData"]["value"]
+            world["GameTimeSaveData"]["value"]["RealDateTimeTicks"]["value"] += 1
+        eager_file, lazy_file = gvas_files
+        lazy_world = lazy_file.properties["worldSaveData"]["value"]
+        self.assertIsInstance(lazy_world["CharacterSaveParameterMap"], LazyProperty)
+        self.assertFalse(lazy_world["CharacterSaveParameterMap"].loaded)
+        self.assertEqual(
+            eager_file.write(PALWORLD_CUSTOM_PROPERTIES),
+            lazy_file.write(PALWORLD_CUSTOM_PROPERTIES),
+            "edited lazy sav does not match edited eager sav",
+        )
+
+    def test_lazy_read_tracks_edits(self):
+        with open("tests/testdata/Level.sav", "rb") as f:
+            data = f.read()
+        gvas_data, _ = decompress_sav_to_gvas(data)
+        lazy_file = GvasFile.read(
+            gvas_data, PALWORLD_TYPE_HINTS, PALWORLD_CUSTOM_PROPERTIES, lazy=True
+        )
+        world_property = lazy_file.properties["worldSaveData"]
+        world = world_property["value"]
+        ticks = world["GameTimeSaveData"]["value"]["RealDateTimeTicks"]
+        # Reading values and dumping to JSON leaves the tree unchanged
+        value = ticks["value"]
+        self.assertIsInstance(json.dumps(lazy_file.dump(), cls=CustomEncoder), str)
+        dump_stream(lazy_file.dump(), io.StringIO())
+        self.assertTrue(world["CharacterSaveParameterMap"].loaded)
+        self.assertTrue(world_property.unchanged())
+        self.assertEqual(gvas_data, lazy_file.write(PALWORLD_CUSTOM_PROPERTIES))
+        # Mutable values may be edited in place, so reading one counts as an edit
+        world["CharacterSaveParameterMap"]["value"]
+        self.assertFalse(world["CharacterSaveParameterMap"].unchanged())
+        self.assertTrue(world["GameTimeSaveData"].unchanged())
+        self.assertFalse(world_property.unchanged())
+        ticks["value"] = value + 1
+        self.assertFalse(world["GameTimeSaveData"].unchanged())
+        eager_file = GvasFile.read(
+            gvas_data, PALWORLD_TYPE_HINTS, PALWORLD_CUSTOM_PROPERTIES
+        )
+        eager_world = eager_file.properties["worldSaveData"]["value"]
+        eager_world["GameTimeSaveData"]["value"]["RealDateTimeTicks"]["value"] += 1
+        self.assertEqual(
+            eager_file.write(PALWORLD_CUSTOM_PROPERTIES),
+            lazy_file.write(PALWORLD_CUSTOM_PROPERTIES),
+            "edited lazy sav does not match edited eager sav",
+        )
+
+    def test_compact_read(self):
+        with open("tests/testdata/Level.sav", "rb") as f:
+            data = f.read()
+        gvas_data, _ = decompress_sav_to_gvas(data)
+        gvas_files = [
+            GvasFile.read(
+                gvas_data,
+                PALWORLD_TYPE_HINTS,
+                PALWORLD_CUSTOM_PROPERTIES,
+                compact=compact,
+            )
+            for compact in (False, True)
+        ]
+        eager_file, compact_file = gvas_files
+        world = compact_file.properties["worldSaveData"]
+        self.assertIsInstance(world, StructProp)
+        self.assertEqual(
+            json.dumps(compact_file.dump(), cls=CustomEncoder),
+            json.dumps(eager_file.dump(), cls=CustomEncoder),
+            "compact sav does not decode to the same JSON",
+        )
+        self.assertEqual(
+            gvas_data,
+            compact_file.write(PALWORLD_CUSTOM_PROPERTIES),
+            "compact sav does not match original",
+        )
+        self.assertNotIsInstance(
+            compact_file.dump()["properties"]["worldSaveData"], PropertyNode
+        )
+        for gvas_file in gvas_files:
+            world = gvas_file.properties["worldSaveData"]["value"]
+            world["GameTimeSaveData"]["value"]["RealDateTimeTicks"]["value"] += 1
+        self.assertEqual(
+            eager_file.write(PALWORLD_CUSTOM_PROPERTIES),
+            compact_file.write(PALWORLD_CUSTOM_PROPERTIES),
+            "edited compact sav does not match edited eager sav",
+        )
+
+    def test_lazy_compact_read(self):
+        with open("tests/testdata/Level.sav", "rb") as f:
+            data = f.read()
+        gvas_data, _ = decompress_sav_to_gvas(data)
+        eager_file = GvasFile.read(
+            gvas_data, PALWORLD_TYPE_HINTS, PALWORLD_CUSTOM_PROPERTIES
+        )
+        lazy_file = GvasFile.read(
+            gvas_data,
+            PALWORLD_TYPE_HINTS,
+            PALWORLD_CUSTOM_PROPERTIES,
+            lazy=True,
+            compact=True,
+        )
+        dump = lazy_file.dump()
+        world = dump["properties"]["worldSaveData"]
+        self.assertIs(type(world), dict)
+        self.assertIs(type(world["value"]["GameTimeSaveData"]), dict)
+        self.assertEqual(
+            json.dumps(dump, cls=CustomEncoder),
+            json.dumps(eager_file.dump(), cls=CustomEncoder),
+            "lazy compact sav does not decode to the same JSON",
+        )
+        self.assertTrue(lazy_file.properties["worldSaveData"].unchanged())
+        self.assertEqual(gvas_data, lazy_file.write(PALWORLD_CUSTOM_PROPERTIES))
+
+    @parameterized.expand([(False,), (True,)])
+    def test_path_filter(self, lazy):
+        with open("tests/testdata/Level.sav", "rb") as f:
+            data = f.read()
+        gvas_data, _ = decompress_sav_to_gvas(data)
+        gvas_file = GvasFile.read(
+            gvas_data, PALWORLD_TYPE_HINTS, PALWORLD_CUSTOM_PROPERTIES
+        )
+        filtered_file = GvasFile.read(
+            gvas_data,
+            PALWORLD_TYPE_HINTS,
+            PALWORLD_CUSTOM_PROPERTIES,
+            lazy=lazy,
+            path_filter=PathFilter(
+                ["worldSaveData.GroupSaveDataMap", "worldSaveData.GameTime*"]
+            ),
+        )
+        self.assertEqual(list(filtered_file.properties), ["worldSaveData"])
+        world = gvas_file.properties["worldSaveData"]["value"]
+        filtered_world = filtered_file.properties["worldSaveData"]["value"]
+        self.assertEqual(list(filtered_world), ["GroupSaveDataMap", "GameTimeSaveData"])
+        for key in filtered_world:
+            self.assertEqual(
+                json.dumps(filtered_world[key], cls=CustomEncoder),
+                json.dumps(world[key], cls=CustomEncoder),
+            )
+        self.assertEqual(filtered_file.trailer, gvas_file.trailer)
+
+    def test_path_filter_cannot_write(self):
+        with open("tests/testdata/Level.sav", "rb") as f:
+            data = f.read()
+        gvas_data, _ = decompress_sav_to_gvas(data)
+        path_filter = PathFilter(["worldSaveData.GameTime*"])
+        filtered_file = GvasFile.read(
+            gvas_data, PALWORLD_TYPE_HINTS, path_filter=path_filter
+        )
+        self.assertTrue(filtered_file.filtered)
+        with self.assertRaises(Exception):
+            filtered_file.write()
+        # Filtered JSON, dumped or streamed, loads as a filtered file
+        js = json.dumps(filtered_file.dump(), cls=CustomEncoder)
+        out = io.StringIO()
+        dump_stream(
+            GvasFile.stream(gvas_data, PALWORLD_TYPE_HINTS, path_filter=path_filter),
+            out,
+        )
+        self.assertEqual(out.getvalue(), js)
+        loaded_file = GvasFile.load(load_stream(io.BytesIO(js.encode("utf-8"))))
+        self.assertTrue(loaded_file.filtered)
+        with self.assertRaises(Exception):
+            loaded_file.write()
+        gvas_file = GvasFile.read(gvas_data, PALWORLD_TYPE_HINTS)
+        self.assertNotIn("filtered", gvas_file.dump())
+
+    def test_read_with_workers(self):
+        with open("tests/testdata/Level.sav", "rb") as f:
+            data = f.read()
+        gvas_data, _ = decompress_sav_to_gvas(data)
+        gvas_file = GvasFile.read(
+            gvas_data, PALWORLD_TYPE_HINTS, PALWORLD_CUSTOM_PROPERTIES
+        )
+        # Small chunks so every parallel decoder is exercised
+        with mock.patch.object(rawdata_common, "PARALLEL_CHUNK_SIZE", 4):
+            parallel_file = GvasFile.read(
+                gvas_data, PALWORLD_TYPE_HINTS, PALWORLD_CUSTOM_PROPERTIES, workers=2
+            )
+        self.assertEqual(
+            json.dumps(parallel_file.dump(), cls=CustomEncoder),
+            json.dumps(gvas_file.dump(), cls=CustomEncoder),
+            "sav decoded with workers does not match serial decode",
+        )
+        self.assertEqual(
+            gvas_data,
+            parallel_file.write(PALWORLD_CUSTOM_PROPERTIES),
+            "sav decoded with workers does not match expected after roundtrip",
+        )
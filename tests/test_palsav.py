@@ -0,0 +1,140 @@
+import io
+import os
+import tempfile
+import tracemalloc
+import unittest
+import zlib
+from unittest import mock
+
+from parameterized import parameterized
+
+from palworld_save_tools import palsav
+from palworld_save_tools.palsav import compress_gvas_to_sav, decompress_sav_to_gvas
+
+
+class TestPalsav(unittest.TestCase):
+    @parameterized.expand(
+        [
+            ("Level.sav", 1),
+            ("Level.sav", 4),
+            ("LocalData.sav", 1),
+            ("LocalData.sav", 4),
+        ]
+    )
+    def test_decompress_threads(self, file_name, threads):
+        with open("tests/testdata/" + file_name, "rb") as f:
+            data = f.read()
+        gvas_data, save_type = decompress_sav_to_gvas(data, threads=threads)
+        self.assertEqual(save_type, 0x32)
+        self.assertEqual(gvas_data, zlib.decompress(zlib.decompress(data[12:])))
+
+    @parameterized.expand([(0x31,), (0x32,)])
+    def test_compress_matches_single_stream(self, save_type):
+        with open("tests/testdata/Level.sav", "rb") as f:
+            gvas_data, _ = decompress_sav_to_gvas(f.read())
+        sav_data = compress_gvas_to_sav(gvas_data, save_type)
+        compressed_data = zlib.compress(gvas_data)
+        if save_type == 0x32:
+            expected_data = zlib.compress(compressed_data)
+        else:
+            expected_data = compressed_data
+        self.assertEqual(sav_data[4:8], len(compressed_data).to_bytes(4, "little"))
+        self.assertEqual(sav_data[12:], expected_data)
+
+    @parameterized.expand(
+        [
+            (0x31, 2, zlib.Z_DEFAULT_COMPRESSION, zlib.Z_DEFAULT_STRATEGY),
+            (0x32, 2, zlib.Z_DEFAULT_COMPRESSION, zlib.Z_DEFAULT_STRATEGY),
+            (0x32, 4, 1, zlib.Z_DEFAULT_STRATEGY),
+            (0x32, 4, 9, zlib.Z_FILTERED),
+            (0x31, 3, 0, zlib.Z_DEFAULT_STRATEGY),
+        ]
+    )
+    def test_compress_roundtrip(self, save_type, threads, level, strategy):
+        with open("tests/testdata/Level.sav", "rb") as f:
+            gvas_data, _ = decompress_sav_to_gvas(f.read())
+        # Small chunks so the data is split between threads
+        with mock.patch.object(palsav, "CHUNK_SIZE", 64 * 1024):
+            sav_data = compress_gvas_to_sav(
+                gvas_data, save_type, level=level, strategy=strategy, threads=threads
+            )
+            self.assertEqual(
+                decompress_sav_to_gvas(sav_data, threads=threads),
+                (gvas_data, save_type),
+            )
+        # The parallel stream is a standard zlib stream
+        compressed_data = sav_data[12:]
+        if save_type == 0x32:
+            compressed_data = zlib.decompress(compressed_data)
+        self.assertEqual(zlib.decompress(compressed_data), gvas_data)
+
+    @parameterized.expand([("path",), ("file",), ("bytesio",), ("bytes",)])
+    def test_decompress_sources(self, source_type):
+        path = "tests/testdata/Level.sav"
+        with open(path, "rb") as f:
+            data = f.read()
+        expected = (zlib.decompress(zlib.decompress(data[12:])), 0x32)
+        if source_type == "path":
+            self.assertEqual(decompress_sav_to_gvas(path), expected)
+        elif source_type == "file":
+            with open(path, "rb") as f:
+                self.assertEqual(decompress_sav_to_gvas(f), expected)
+        elif source_type == "bytesio":
+            self.assertEqual(decompress_sav_to_gvas(io.BytesIO(data)), expected)
+        else:
+            self.assertEqual(decompress_sav_to_gvas(data), expected)
+
+    @parameterized.expand([(1,), (2,)])
+    def test_decompress_bad_file(self, threads):
+        with open("tests/testdata/Level.sav", "rb") as f:
+            data = f.read()
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "Level.sav")
+            with open(path, "wb") as f:
+                f.write(data[:-16])
+            with self.assertRaises(zlib.error):
+                decompress_sav_to_gvas(path, threads=threads)
+            # Header claims less data than the file holds
+            with open(path, "wb") as f:
+                f.write((1024).to_bytes(4, "little") + data[4:])
+            with self.assertRaisesRegex(Exception, "incorrect uncompressed length"):
+                decompress_sav_to_gvas(path, threads=threads)
+
+    def test_decompress_bad_length_not_allocated(self):
+        gvas_data = b"\x00" * 1024
+        sav_data = bytearray(compress_gvas_to_sav(gvas_data, 0x31))
+        # Header claims 4 GiB of data
+        sav_data[0:4] = (2**32 - 1).to_bytes(4, "little")
+        tracemalloc.start()
+        try:
+            with self.assertRaisesRegex(Exception, "incorrect uncompressed length"):
+                decompress_sav_to_gvas(bytes(sav_data))
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        self.assertLess(peak, 1024 * 1024)
+
+    def test_decompress_grows_past_ratio(self):
+        gvas_data = os.urandom(64) * 4096
+        sav_data = compress_gvas_to_sav(gvas_data, 0x32)
+        with mock.patch.object(palsav, "MAX_ZLIB_RATIO", 1):
+            self.assertEqual(decompress_sav_to_gvas(sav_data), (gvas_data, 0x32))
+
+    def test_decompress_truncated(self):
+        with open("tests/testdata/Level.sav", "rb") as f:
+            data = f.read()
+        with self.assertRaises(zlib.error):
+            decompress_sav_to_gvas(data[:-16], threads=2)
+
+    @parameterized.expand([(1, 0), (0, 9), (1, None)])
+    def test_compress_outer_level(self, level, outer_level):
+        with open("tests/testdata/Level.sav", "rb") as f:
+            gvas_data, _ = decompress_sav_to_gvas(f.read())
+        sav_data = compress_gvas_to_sav(
+            gvas_data, 0x32, level=level, outer_level=outer_level
+        )
+        self.assertEqual(decompress_sav_to_gvas(sav_data), (gvas_data, 0x32))
+        if outer_level is None:
+            # The outer level defaults to the inner level
+            compressed_data = zlib.compress(gvas_data, level)
+            self.assertEqual(sav_data[12:], zlib.compress(compressed_data, level))